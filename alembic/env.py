@@ -14,10 +14,14 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# The app's settings (.env / environment) decide which database is migrated
+from config import get_settings
+config.set_main_option("sqlalchemy.url", get_settings().database_url.replace("%", "%%"))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 from database import Base
-from schemas import users, bookings, rooms  # Make sure models are imported
+from schemas import users, bookings, rooms, room_nights, daily_room_stats  # Make sure models are imported
 
 target_metadata = Base.metadata
 
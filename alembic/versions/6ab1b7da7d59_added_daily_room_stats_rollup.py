@@ -0,0 +1,72 @@
+"""Added daily_room_stats rollup
+
+Revision ID: 6ab1b7da7d59
+Revises: 909163782a37
+Create Date: 2026-10-18 04:56:58.959753
+
+"""
+from collections import defaultdict
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6ab1b7da7d59'
+down_revision: Union[str, Sequence[str], None] = '909163782a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    daily_room_stats = op.create_table('daily_room_stats',
+    sa.Column('stat_date', sa.Date(), nullable=False),
+    sa.Column('room_type', sa.Enum('single', 'double', 'twin', 'suite', 'deluxe', 'family', name='roomtype'), nullable=False),
+    sa.Column('rooms_sold', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('stat_date', 'room_type')
+    )
+
+    # Backfill from confirmed bookings, spreading each price evenly over its nights
+    bookings = sa.table('bookings',
+    sa.column('room_id', sa.Integer()),
+    sa.column('check_in', sa.DateTime()),
+    sa.column('check_out', sa.DateTime()),
+    sa.column('total_price', sa.Float()),
+    sa.column('status', sa.String())
+    )
+    rooms = sa.table('rooms',
+    sa.column('id', sa.Integer()),
+    sa.column('type', sa.String())
+    )
+    rows = op.get_bind().execute(
+        sa.select(bookings.c.check_in, bookings.c.check_out, bookings.c.total_price, rooms.c.type)
+        .join(rooms, rooms.c.id == bookings.c.room_id)
+        .where(bookings.c.status == 'confirmed')
+    )
+
+    stats = defaultdict(lambda: [0, 0.0])
+    for check_in, check_out, total_price, room_type in rows:
+        first_night = check_in.date()
+        nights = max((check_out.date() - first_night).days, 1)
+        for n in range(nights):
+            key = (first_night + timedelta(days=n), room_type)
+            stats[key][0] += 1
+            stats[key][1] += total_price / nights
+
+    batch = [
+        {'stat_date': stat_date, 'room_type': room_type, 'rooms_sold': sold, 'revenue': revenue}
+        for (stat_date, room_type), (sold, revenue) in stats.items()
+    ]
+    for start in range(0, len(batch), BATCH_SIZE):
+        op.bulk_insert(daily_room_stats, batch[start:start + BATCH_SIZE])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_room_stats')
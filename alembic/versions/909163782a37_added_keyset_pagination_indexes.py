@@ -0,0 +1,38 @@
+"""Added keyset pagination indexes
+
+Revision ID: 909163782a37
+Revises: f33f8c106dd1
+Create Date: 2026-10-18 04:55:17.674336
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '909163782a37'
+down_revision: Union[str, Sequence[str], None] = 'f33f8c106dd1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_bookings_check_in_id', 'bookings', ['check_in', 'id'], unique=False)
+    op.create_index('ix_bookings_status_check_in_id', 'bookings', ['status', 'check_in', 'id'], unique=False)
+    op.create_index('ix_bookings_user_id_check_in_id', 'bookings', ['user_id', 'check_in', 'id'], unique=False)
+    op.create_index('ix_rooms_available_room_number_id', 'rooms', ['is_available', 'room_number', 'id'], unique=False)
+    op.create_index('ix_rooms_type_room_number_id', 'rooms', ['type', 'room_number', 'id'], unique=False)
+    op.create_index('ix_users_created_on_id', 'users', ['created_on', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_on_id', table_name='users')
+    op.drop_index('ix_rooms_type_room_number_id', table_name='rooms')
+    op.drop_index('ix_rooms_available_room_number_id', table_name='rooms')
+    op.drop_index('ix_bookings_user_id_check_in_id', table_name='bookings')
+    op.drop_index('ix_bookings_status_check_in_id', table_name='bookings')
+    op.drop_index('ix_bookings_check_in_id', table_name='bookings')
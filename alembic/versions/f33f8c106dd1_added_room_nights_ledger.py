@@ -0,0 +1,79 @@
+"""Added room_nights ledger
+
+Revision ID: f33f8c106dd1
+Revises: aabb82181117
+Create Date: 2026-10-18 04:53:27.578709
+
+"""
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f33f8c106dd1'
+down_revision: Union[str, Sequence[str], None] = 'aabb82181117'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    room_nights = op.create_table('room_nights',
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('night', sa.Date(), nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('room_id', 'night')
+    )
+    op.create_index(op.f('ix_room_nights_booking_id'), 'room_nights', ['booking_id'], unique=False)
+
+    # The ledger guards overlaps now. The old key also held the period of cancelled and
+    # expired bookings; the new index keeps room_id indexed for its foreign key.
+    op.create_index('ix_bookings_room_id_check_in_id', 'bookings', ['room_id', 'check_in', 'id'], unique=False)
+    op.drop_constraint('uq_room_booking_period', 'bookings', type_='unique')
+
+    # Backfill one row per night of every active booking. Overlaps that slipped through
+    # the old read-then-insert check keep the night for the oldest booking only.
+    bookings = sa.table('bookings',
+    sa.column('id', sa.Integer()),
+    sa.column('room_id', sa.Integer()),
+    sa.column('check_in', sa.DateTime()),
+    sa.column('check_out', sa.DateTime()),
+    sa.column('status', sa.String())
+    )
+    rows = op.get_bind().execute(
+        sa.select(bookings.c.id, bookings.c.room_id, bookings.c.check_in, bookings.c.check_out)
+        .where(bookings.c.status.in_(['pending', 'confirmed']))
+        .order_by(bookings.c.id)
+    )
+
+    claimed = set()
+    batch = []
+    for booking_id, room_id, check_in, check_out in rows:
+        first_night, last_day = check_in.date(), check_out.date()
+        nights = max((last_day - first_night).days, 1)
+        for n in range(nights):
+            key = (room_id, first_night + timedelta(days=n))
+            if key in claimed:
+                continue
+            claimed.add(key)
+            batch.append({'room_id': room_id, 'night': key[1], 'booking_id': booking_id})
+            if len(batch) >= BATCH_SIZE:
+                op.bulk_insert(room_nights, batch)
+                batch = []
+    if batch:
+        op.bulk_insert(room_nights, batch)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_unique_constraint('uq_room_booking_period', 'bookings', ['room_id', 'check_in', 'check_out'])
+    op.drop_index('ix_bookings_room_id_check_in_id', table_name='bookings')
+    op.drop_index(op.f('ix_room_nights_booking_id'), table_name='room_nights')
+    op.drop_table('room_nights')
@@ -0,0 +1,189 @@
+"""
+Seeded synthetic hotel data for the benchmarks.
+
+Rooms are spread over every RoomType; each room gets back-to-back stays over the last
+`years` years plus a booking horizon into the future, with gaps, short and long stays,
+cancellations that overlap the stay rebooked after them, and a status mix that depends
+on whether the stay is past or upcoming. The same seed always yields the same data.
+
+    python -m bench.datagen --database-url sqlite:///bench.db --rooms 200 --years 2
+"""
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from random import Random
+from typing import Dict, List
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+import argparse
+import os
+
+BENCH_ADMIN_EMAIL = "bench.admin@example.com"
+BENCH_PASSWORD = "bench-password"
+
+# capacity, base price per night
+ROOM_PROFILES = {
+    "single": (1, 60.0),
+    "double": (2, 90.0),
+    "twin": (2, 85.0),
+    "suite": (4, 240.0),
+    "deluxe": (3, 160.0),
+    "family": (5, 180.0),
+}
+ROOM_TYPE_WEIGHTS = {"single": 20, "double": 30, "twin": 15, "suite": 5, "deluxe": 15, "family": 15}
+# Nights per stay, weighted towards short business stays
+STAY_LENGTHS = [1, 2, 3, 4, 5, 7, 10, 14]
+STAY_LENGTH_WEIGHTS = [25, 25, 18, 10, 8, 8, 4, 2]
+FUTURE_HORIZON_DAYS = 120
+INSERT_BATCH_SIZE = 5000
+
+
+@dataclass
+class GeneratedData:
+    rooms: int = 0
+    users: int = 0
+    bookings: int = 0
+    room_nights: int = 0
+    status_counts: Dict[str, int] = field(default_factory=dict)
+    first_day: str = ""
+    last_day: str = ""
+
+
+def _insert(db: Session, table, rows: List[dict]) -> None:
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        db.execute(insert(table), rows[start:start + INSERT_BATCH_SIZE])
+
+
+def _status(rng: Random, check_out: datetime, now: datetime) -> str:
+    roll = rng.random()
+    if check_out <= now:
+        # Past stays: mostly honoured, some cancelled, a few pending never confirmed
+        return "confirmed" if roll < 0.82 else "cancelled" if roll < 0.97 else "pending"
+    return "confirmed" if roll < 0.55 else "pending" if roll < 0.93 else "cancelled"
+
+
+def generate(db: Session, rooms: int = 200, years: float = 2, guests: int = 500, seed: int = 42) -> GeneratedData:
+    """Fill an empty database; returns what was generated"""
+    from schemas.bookings import Bookings
+    from schemas.room_nights import RoomNights
+    from schemas.rooms import Rooms, RoomType
+    from schemas.users import Users, UserRole
+    from services.report_service import rebuild_daily_room_stats
+    from utils.auth import hash_password
+    from utils.stays import get_stay_nights
+
+    if db.query(func.count(Rooms.id)).scalar() or db.query(func.count(Users.id)).scalar():
+        raise RuntimeError("The benchmark data generator needs an empty database")
+
+    rng = Random(seed)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    first_day = today - timedelta(days=int(365 * years))
+    last_day = today + timedelta(days=FUTURE_HORIZON_DAYS)
+
+    # One hash for everyone: Argon2 per synthetic user would dominate the run
+    password = hash_password(BENCH_PASSWORD)
+    users = [{
+        "id": 1, "first_name": "Bench", "last_name": "Admin", "email": BENCH_ADMIN_EMAIL,
+        "password": password, "role": UserRole.ADMIN
+    }]
+    users += [{
+        "id": user_id, "first_name": f"Guest{user_id}", "last_name": "Bench",
+        "email": f"guest{user_id}@example.com", "password": password,
+        "role": UserRole.MANAGER if user_id % 50 == 0 else UserRole.NORMAL
+    } for user_id in range(2, guests + 2)]
+    _insert(db, Users, users)
+
+    types = list(ROOM_TYPE_WEIGHTS)
+    room_rows = []
+    for room_id in range(1, rooms + 1):
+        room_type = rng.choices(types, weights=[ROOM_TYPE_WEIGHTS[t] for t in types])[0]
+        capacity, base_price = ROOM_PROFILES[room_type]
+        has_offer = rng.random() < 0.15
+        room_rows.append({
+            "id": room_id,
+            "room_number": f"{room_id // 40 + 1}{room_id % 40:02d}-{room_id}",
+            "floor": room_id // 40 + 1,
+            "type": RoomType[room_type],
+            "description": f"{room_type.title()} room, synthetic benchmark data " * 4,
+            "price_per_night": round(base_price * rng.uniform(0.85, 1.25), 2),
+            "currency": "USD",
+            "capacity": capacity,
+            "is_available": rng.random() > 0.02,
+            "is_under_maintenance": rng.random() < 0.02,
+            "has_offer": has_offer,
+            "discount_percent": rng.choice([10.0, 15.0, 20.0]) if has_offer else 0.0,
+            "created_by": 1,
+        })
+    _insert(db, Rooms, room_rows)
+
+    result = GeneratedData(rooms=rooms, users=len(users), first_day=first_day.date().isoformat(),
+                           last_day=last_day.date().isoformat())
+    bookings, nights_rows = [], []
+    booking_id = 0
+    for room in room_rows:
+        discount = (100 - room["discount_percent"]) / 100
+        cursor = first_day + timedelta(days=rng.randint(0, 6))
+        while cursor < last_day:
+            cursor += timedelta(days=rng.choices([0, 1, 2, 3, 7], weights=[45, 25, 12, 10, 8])[0])
+            length = rng.choices(STAY_LENGTHS, weights=STAY_LENGTH_WEIGHTS)[0]
+            check_in = cursor.replace(hour=14)
+            check_out = (cursor + timedelta(days=length)).replace(hour=11)
+            status = _status(rng, check_out, today)
+            booking_id += 1
+            bookings.append({
+                "id": booking_id,
+                "room_id": room["id"],
+                "user_id": rng.randint(2, guests + 1) if guests else None,
+                "check_in": check_in,
+                "check_out": check_out,
+                "guests": rng.randint(1, room["capacity"]),
+                "total_price": round(room["price_per_night"] * length * discount, 2),
+                "status": status,
+                "notes": "Late arrival, quiet room please" if rng.random() < 0.2 else None,
+                "created_by": 1,
+            })
+            result.status_counts[status] = result.status_counts.get(status, 0) + 1
+            if status == "cancelled":
+                # The nights went back on sale: the next stay usually overlaps this one
+                cursor += timedelta(days=1)
+                continue
+            nights_rows.extend(
+                {"room_id": room["id"], "night": night, "booking_id": booking_id}
+                for night in get_stay_nights(check_in, check_out)
+            )
+            cursor = check_out.replace(hour=0)
+
+    _insert(db, Bookings, bookings)
+    _insert(db, RoomNights, nights_rows)
+    db.commit()
+    rebuild_daily_room_stats(db)
+
+    result.bookings = len(bookings)
+    result.room_nights = len(nights_rows)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic hotel data into an empty database")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--guests", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from database import Base, SessionLocal, engine
+    import schemas.daily_room_stats, schemas.room_nights, schemas.rooms  # noqa: F401 (register the tables)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print(generate(db, args.rooms, args.years, args.guests, args.seed))
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
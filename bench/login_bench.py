@@ -0,0 +1,98 @@
+"""
+Login throughput of the Argon2 verification path, per cost configuration and pool size.
+
+Each "login" is one verify_and_update() call, issued from a thread pool the size of
+--concurrency the way FastAPI's threadpool issues them. workers=0 verifies inline in
+those threads (the old behaviour), workers>0 goes through a spawn process pool.
+
+    python -m bench.login_bench --logins 200 --concurrency 16 \
+        --config 2,19456,1 --config 3,65536,4 --workers 0 --workers 2 --workers 4
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from statistics import median
+from utils import password_hashing
+import argparse
+import json
+import multiprocessing
+import time
+
+PASSWORD = "correct horse battery staple"
+
+
+def parse_config(value: str):
+    time_cost, memory_cost, parallelism = (int(part) for part in value.split(","))
+    return time_cost, memory_cost, parallelism
+
+
+def run(config, workers: int, logins: int, concurrency: int) -> dict:
+    stored_hash = password_hashing.build_context(*config).hash(PASSWORD)
+    pool = None
+    if workers > 0:
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=password_hashing._init_worker,
+            initargs=config
+        )
+        # Start the workers before timing
+        list(pool.map(password_hashing._hash, [PASSWORD] * workers))
+    else:
+        password_hashing._init_worker(*config)
+
+    def login(_):
+        started = time.perf_counter()
+        if pool is not None:
+            verified, _ = pool.submit(password_hashing._verify_and_update, PASSWORD, stored_hash).result()
+        else:
+            verified, _ = password_hashing._verify_and_update(PASSWORD, stored_hash)
+        assert verified
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as requests:
+        latencies = sorted(requests.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    if pool is not None:
+        pool.shutdown()
+    password_hashing._worker_context = None
+
+    return {
+        "time_cost": config[0],
+        "memory_cost_kib": config[1],
+        "parallelism": config[2],
+        "workers": workers,
+        "logins": logins,
+        "logins_per_sec": round(logins / elapsed, 2),
+        "p50_ms": round(median(latencies) * 1000, 1),
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Argon2 login throughput per configuration")
+    parser.add_argument("--config", action="append", type=parse_config,
+                        help="time_cost,memory_cost_kib,parallelism (repeatable)")
+    parser.add_argument("--workers", action="append", type=int, help="process pool size, 0 = inline (repeatable)")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    configs = args.config or [(password_hashing.ARGON2_TIME_COST, password_hashing.ARGON2_MEMORY_COST,
+                               password_hashing.ARGON2_PARALLELISM)]
+    workers = args.workers or [0, password_hashing.PASSWORD_HASH_WORKERS]
+
+    results = [run(config, count, args.logins, args.concurrency) for config in configs for count in workers]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'t':>3} {'m (KiB)':>8} {'p':>3} {'workers':>8} {'logins/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(f"{r['time_cost']:>3} {r['memory_cost_kib']:>8} {r['parallelism']:>3} {r['workers']:>8} "
+              f"{r['logins_per_sec']:>10} {r['p50_ms']:>8} {r['p99_ms']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Microbenchmark of response serialisation for the list endpoints: the response_model
+path FastAPI takes for a plain return value (validate against the model, then the stdlib
+encoder) against FastJSONResponse (rows straight to orjson), on real pages of rows from
+the services over a seeded SQLite database.
+
+    python -m bench.serialization_bench --rows 100 --repeat 200
+
+"fast_stdlib" is the FastJSONResponse path with orjson unavailable, which separates the
+cost of the validation from the cost of the encoder.
+"""
+from statistics import median
+from typing import Callable, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+
+def _time_per_call(operation: Callable[[], bytes], repeat: int) -> float:
+    """Median over 5 rounds of the per-call time in microseconds"""
+    operation()
+    rounds = []
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            operation()
+        rounds.append((time.perf_counter() - started) / repeat * 1e6)
+    return round(median(rounds), 1)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare response_model serialisation with FastJSONResponse")
+    parser.add_argument("--rows", type=int, default=100, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=200, help="serialisations per timing round")
+    args = parser.parse_args(argv)
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='hotel-serialise-'), 'bench.db')}"
+    from datetime import datetime, timedelta
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import APIRoute, serialize_response
+    from database import Base, SessionLocal, engine
+    from bench.datagen import generate
+    from routers import booking_router, rooms_router
+    from services import booking_service, room_service
+    from utils import fast_json
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        generate(db, rooms=max(args.rows, 50), years=0.5, guests=100)
+        check_in = datetime.now().replace(hour=14, minute=0, second=0, microsecond=0) + timedelta(days=400)
+        # (name, route path, what the endpoint hands to the serialiser)
+        pages = [
+            ("GET /bookings/", "/bookings/",
+             {"items": booking_service.get_all_bookings(db, None, args.rows)[0], "next_cursor": "cursor"}),
+            ("GET /bookings/?expand=room,user", "/bookings/", {
+                "items": booking_service.get_all_bookings(db, None, args.rows, expand="room,user")[0],
+                "next_cursor": "cursor"
+            }),
+            ("GET /rooms/", "/rooms/",
+             {"items": room_service.get_all_rooms(db, None, args.rows)[0], "next_cursor": "cursor"}),
+            ("GET /rooms/search", "/rooms/search",
+             room_service.search_available_rooms(db, check_in, check_in + timedelta(days=2), 1)[:args.rows]),
+        ]
+    finally:
+        db.close()
+
+    routes = {
+        route.path: route for router in (booking_router.router, rooms_router.router) for route in router.routes
+        if isinstance(route, APIRoute) and "GET" in route.methods
+    }
+    loop = asyncio.new_event_loop()
+    orjson_module = fast_json.orjson
+    report = {"orjson": orjson_module is not None, "rows": args.rows, "microseconds_per_response": {}}
+
+    for name, path, content in pages:
+        route = routes[path]
+
+        def validated():
+            serialised = loop.run_until_complete(serialize_response(
+                field=route.response_field, response_content=content,
+                exclude_unset=route.response_model_exclude_unset, is_coroutine=False
+            ))
+            return JSONResponse(serialised).body
+
+        def fast():
+            return fast_json.FastJSONResponse(content).body
+
+        def fast_stdlib():
+            fast_json.orjson = None
+            try:
+                return fast_json.FastJSONResponse(content).body
+            finally:
+                fast_json.orjson = orjson_module
+
+        # Same document either way, whatever the encoder
+        assert json.loads(validated()) == json.loads(fast()) == json.loads(fast_stdlib()), name
+        timings = {
+            "validated": _time_per_call(validated, args.repeat),
+            "fast": _time_per_call(fast, args.repeat),
+            "fast_stdlib": _time_per_call(fast_stdlib, args.repeat),
+        }
+        timings["speedup"] = round(timings["validated"] / timings["fast"], 1)
+        report["microseconds_per_response"][name] = timings
+        print(f"{name:<34} {json.dumps(timings)}", flush=True)
+
+    loop.close()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
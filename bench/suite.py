@@ -0,0 +1,282 @@
+"""
+Scenario benchmarks against a seeded local database, with a JSON report.
+
+The app runs in-process (sync stack, or async with DB_ASYNC=true) through Starlette's
+TestClient, so every request goes through routing, validation, services and the real
+database driver. By default the database is a fresh SQLite file standing in for MySQL;
+pass --database-url to point at another empty database.
+
+    python -m bench.suite --rooms 200 --years 2 --output bench-report.json
+    python -m bench.suite --compare bench-report.json          # diff against a previous run
+
+Scenarios: booking_contention (many clients booking a few hot rooms), availability_search,
+pagination_depth (keyset pages from the first to the deepest), login, export.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from datetime import datetime, timedelta
+from random import Random
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))] * 1000, 2)
+
+
+def measure(operation: Callable[[int], int], iterations: int, concurrency: int) -> dict:
+    """Run operation(i) -> status code `iterations` times from `concurrency` threads"""
+    def timed(i):
+        started = time.perf_counter()
+        status_code = operation(i)
+        return time.perf_counter() - started, status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, range(iterations)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+    return {
+        "operations": iterations,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "ops_per_sec": round(iterations / elapsed, 2),
+        "p50_ms": _percentile(latencies, 0.50),
+        "p95_ms": _percentile(latencies, 0.95),
+        "p99_ms": _percentile(latencies, 0.99),
+        "statuses": dict(Counter(str(status_code) for _, status_code in results)),
+    }
+
+
+class Suite:
+    def __init__(self, client, headers: dict, data, rng: Random, scale: float):
+        self.client = client
+        self.headers = headers
+        self.data = data
+        self.rng = rng
+        self.scale = scale
+        self.future_start = datetime.fromisoformat(data.last_day) + timedelta(days=30)
+
+    def _n(self, base: int) -> int:
+        return max(1, int(base * self.scale))
+
+    def booking_contention(self) -> dict:
+        """Concurrent creates on 3 hot rooms over a 30-day window: most attempts collide"""
+        from database import SessionLocal
+        from schemas.rooms import Rooms
+
+        db = SessionLocal()
+        try:
+            hot_rooms = [room.id for room in db.query(Rooms).filter(
+                Rooms.is_available == True, Rooms.is_under_maintenance == False
+            ).order_by(Rooms.id).limit(3)]
+        finally:
+            db.close()
+
+        stays = []
+        for _ in range(self._n(300)):
+            check_in = self.future_start + timedelta(days=self.rng.randint(0, 29), hours=14)
+            stays.append((self.rng.choice(hot_rooms), check_in, check_in + timedelta(days=self.rng.randint(1, 3))))
+
+        def book(i):
+            room_id, check_in, check_out = stays[i]
+            return self.client.post("/bookings/", headers=self.headers, json={
+                "room_id": room_id, "check_in": check_in.isoformat(), "check_out": check_out.isoformat(),
+                "guests": 1, "total_price": 100.0, "status": "confirmed"
+            }).status_code
+
+        result = measure(book, len(stays), concurrency=16)
+        result["double_booked_nights"] = self._double_booked_nights(hot_rooms)
+        return result
+
+    def _double_booked_nights(self, room_ids: List[int]) -> int:
+        """Consistency check: active bookings of the hot rooms must never share a night"""
+        from database import SessionLocal
+        from schemas.bookings import Bookings
+        from utils.stays import get_stay_nights
+
+        db = SessionLocal()
+        try:
+            taken = Counter()
+            for room_id, check_in, check_out in db.query(Bookings.room_id, Bookings.check_in, Bookings.check_out).filter(
+                Bookings.room_id.in_(room_ids), Bookings.status.in_(["pending", "confirmed"])
+            ):
+                taken.update((room_id, night) for night in get_stay_nights(check_in, check_out))
+            return sum(1 for times in taken.values() if times > 1)
+        finally:
+            db.close()
+
+    def availability_search(self) -> dict:
+        today = datetime.now().replace(hour=14, minute=0, second=0, microsecond=0)
+        searches = []
+        for _ in range(self._n(200)):
+            check_in = today + timedelta(days=self.rng.randint(0, 90))
+            params = {
+                "check_in": check_in.isoformat(),
+                "check_out": (check_in + timedelta(days=self.rng.randint(1, 7))).isoformat(),
+                "guests": self.rng.randint(1, 4),
+            }
+            if self.rng.random() < 0.3:
+                params["type"] = self.rng.choice(["Single", "Double", "Twin", "Suite", "Deluxe", "Family"])
+            searches.append(params)
+
+        return measure(lambda i: self.client.get("/rooms/search", params=searches[i]).status_code,
+                       len(searches), concurrency=8)
+
+    def pagination_depth(self, limit: int = 100) -> dict:
+        """Walk /bookings page by page; keyset pages should cost the same at any depth"""
+        latencies, cursor, pages = [], None, 0
+        max_pages = self._n(500)
+        while pages < max_pages:
+            params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+            started = time.perf_counter()
+            response = self.client.get("/bookings/", params=params)
+            latencies.append(time.perf_counter() - started)
+            pages += 1
+            cursor = response.json()["next_cursor"]
+            if not cursor:
+                break
+
+        first, last = sorted(latencies[:10]), sorted(latencies[-10:])
+        return {
+            "pages": pages,
+            "page_size": limit,
+            "seconds": round(sum(latencies), 3),
+            "first_pages_p50_ms": _percentile(first, 0.5),
+            "deepest_pages_p50_ms": _percentile(last, 0.5),
+            "depth_slowdown": round(_percentile(last, 0.5) / _percentile(first, 0.5), 2),
+        }
+
+    def login(self) -> dict:
+        from bench.datagen import BENCH_ADMIN_EMAIL, BENCH_PASSWORD
+
+        credentials = {"email": BENCH_ADMIN_EMAIL, "password": BENCH_PASSWORD}
+        return measure(lambda i: self.client.post("/api/users/login", json=credentials).status_code,
+                       self._n(40), concurrency=8)
+
+    def export(self) -> dict:
+        results = {}
+        for export_format in ("ndjson", "csv"):
+            started = time.perf_counter()
+            size = lines = 0
+            with self.client.stream("GET", "/bookings/export", params={"format": export_format},
+                                    headers=self.headers) as response:
+                for chunk in response.iter_bytes():
+                    size += len(chunk)
+                    lines += chunk.count(b"\n")
+            elapsed = time.perf_counter() - started
+            results[export_format] = {
+                "rows": lines - (1 if export_format == "csv" else 0),
+                "bytes": size,
+                "seconds": round(elapsed, 3),
+                "rows_per_sec": round(lines / elapsed, 1),
+            }
+        return results
+
+
+SCENARIOS = ("booking_contention", "availability_search", "pagination_depth", "login", "export")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous: dict, current: dict) -> List[str]:
+    """One line per headline metric: value before, after and the change"""
+    lines = []
+    for name, result in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        for metric in ("ops_per_sec", "p95_ms", "deepest_pages_p50_ms"):
+            if metric in result and before.get(metric):
+                change = 100 * (result[metric] - before[metric]) / before[metric]
+                lines.append(f"{name:<22} {metric:<22} {before[metric]:>10} -> {result[metric]:>10} ({change:+.1f}%)")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scenario benchmarks and write a JSON report")
+    parser.add_argument("--database-url", help="empty database to use (default: a fresh SQLite file)")
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--guests", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for the number of operations")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="run only these (repeatable)")
+    parser.add_argument("--output", default="bench-report.json")
+    parser.add_argument("--compare", help="previous report to diff against")
+    args = parser.parse_args()
+
+    workdir = None
+    if not args.database_url:
+        workdir = tempfile.mkdtemp(prefix="hotel-bench-")
+        args.database_url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    # Must be in place before the app (and its engine) is imported
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("ASYNC_DATABASE_URL", args.database_url.replace("sqlite://", "sqlite+aiosqlite://", 1))
+    # The tables come from the models below, not from the migrations
+    os.environ.setdefault("DB_SCHEMA_CHECK", "off")
+
+    from fastapi.testclient import TestClient
+    from database import Base, SessionLocal, engine
+    from bench.datagen import BENCH_ADMIN_EMAIL, generate
+    from utils.auth import create_access_token
+    import main as app_module
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        data = generate(db, args.rooms, args.years, args.guests, args.seed)
+        generation_seconds = time.perf_counter() - started
+    finally:
+        db.close()
+
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": BENCH_ADMIN_EMAIL, "role": "ADMIN"})}
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": engine.dialect.name,
+            "async_stack": os.getenv("DB_ASYNC", "false"),
+            "seed": args.seed,
+            "scale": args.scale,
+            "data": {**vars(data), "generation_seconds": round(generation_seconds, 2)},
+        },
+        "scenarios": {},
+    }
+
+    with TestClient(app_module.app) as client:
+        suite = Suite(client, headers, data, Random(args.seed), args.scale)
+        for name in args.scenario or SCENARIOS:
+            print(f"running {name} ...", flush=True)
+            report["scenarios"][name] = getattr(suite, name)()
+            print(json.dumps(report["scenarios"][name]), flush=True)
+
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as previous:
+            print("\n".join(compare(json.load(previous), report)))
+
+
+if __name__ == "__main__":
+    main()
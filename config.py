@@ -0,0 +1,296 @@
+# config.py
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+from dotenv import load_dotenv
+import os
+import tempfile
+import urllib.parse
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+SCHEMA_CHECK_MODES = ("off", "warn", "strict")
+LOG_LEVEL_NAMES = ("debug", "info", "warning", "error", "critical")
+LOG_FORMATS = ("json", "text")
+
+
+class SettingsError(ValueError):
+    """One or more settings are missing or malformed; the message lists all of them"""
+
+
+class _EnvReader:
+    """Typed reads from the environment, collecting every problem instead of stopping at the first"""
+
+    def __init__(self, environ: Mapping[str, str]):
+        self.environ = environ
+        self.errors: List[str] = []
+
+    def string(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        value = self.environ.get(name)
+        return value if value not in (None, "") else default
+
+    def strings(self, name: str) -> Tuple[str, ...]:
+        """A comma-separated list"""
+        return tuple(item.strip() for item in self.string(name, "").split(",") if item.strip())
+
+    def pairs(self, name: str, parse: Callable[[str], object]) -> Dict[str, object]:
+        """A comma-separated list of key=value; parse raises ValueError for a bad value"""
+        parsed = {}
+        for item in self.strings(name):
+            key, _, raw = item.partition("=")
+            try:
+                if not key.strip() or not raw.strip():
+                    raise ValueError
+                parsed[key.strip()] = parse(raw.strip())
+            except ValueError:
+                self.errors.append(f"{name}: {item!r} is not a valid <name>=<value> entry")
+        return parsed
+
+    def _number(self, name: str, default, parse, minimum, maximum=None):
+        raw = self.string(name)
+        if raw is None:
+            return default
+        try:
+            value = parse(raw)
+        except ValueError:
+            self.errors.append(f"{name}={raw!r} is not a valid {parse.__name__}")
+            return default
+        if minimum is not None and value < minimum:
+            self.errors.append(f"{name}={raw!r} must be at least {minimum}")
+        if maximum is not None and value > maximum:
+            self.errors.append(f"{name}={raw!r} must be at most {maximum}")
+        return value
+
+    def integer(self, name: str, default: int, minimum: Optional[int] = 0, maximum: Optional[int] = None) -> int:
+        return self._number(name, default, int, minimum, maximum)
+
+    def decimal(self, name: str, default: float, minimum: Optional[float] = 0,
+                maximum: Optional[float] = None) -> float:
+        return self._number(name, default, float, minimum, maximum)
+
+    def flag(self, name: str, default: bool) -> bool:
+        raw = self.string(name)
+        if raw is None:
+            return default
+        if raw.lower() in TRUE_VALUES:
+            return True
+        if raw.lower() in FALSE_VALUES:
+            return False
+        self.errors.append(f"{name}={raw!r} is not a boolean (true/false)")
+        return default
+
+    def choice(self, name: str, default: str, choices) -> str:
+        value = self.string(name, default).lower()
+        if value not in choices:
+            self.errors.append(f"{name}={value!r} must be one of {', '.join(choices)}")
+            return default
+        return value
+
+
+def _log_level(raw: str) -> str:
+    if raw.lower() not in LOG_LEVEL_NAMES:
+        raise ValueError(raw)
+    return raw.upper()
+
+
+def _rate(raw: str) -> float:
+    rate = float(raw)
+    if not 0 <= rate <= 1:
+        raise ValueError(raw)
+    return rate
+
+
+@dataclass(frozen=True)
+class Settings:
+    # Database: DATABASE_URL / ASYNC_DATABASE_URL override the MySQL settings, e.g. to point
+    # the benchmarks at a local stand-in (sqlite:///bench.db, sqlite+aiosqlite:///bench.db)
+    database_url: str
+    async_database_url: str
+    # Read replicas (comma-separated URLs) serving the read-only endpoints; none = everything
+    # on the primary. The async stack reads from ASYNC_DB_REPLICA_URLS (none = the primary).
+    db_replica_urls: Tuple[str, ...]
+    async_db_replica_urls: Tuple[str, ...]
+    # A client that just wrote reads from the primary for this long (read-your-writes); keep
+    # it above the replicas' usual lag. 0 never pins.
+    db_read_your_writes_seconds: float
+    # Serve users/rooms/bookings from async handlers on an asyncio driver instead of the threadpool
+    db_async: bool
+    # Connection pool, shared by the sync and async engines
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_timeout: float
+    # Recycle connections before MySQL's wait_timeout closes them server-side
+    db_pool_recycle: int
+    db_pool_pre_ping: bool
+    db_pool_use_lifo: bool
+    # Schema: Alembic owns it. DB_CREATE_ALL=true creates missing tables from the models at
+    # startup (throwaway databases only); otherwise DB_SCHEMA_CHECK compares the database
+    # with the migrations head and warns, fails startup (strict) or skips the check (off).
+    db_create_all: bool
+    db_schema_check: str
+
+    # JWT
+    secret_key: str
+    algorithm: str
+    access_token_expire_minutes: int
+
+    booking_index_enabled: bool
+    # Other workers write to the same table, so the index is reloaded from the DB after this many seconds
+    booking_index_max_age_seconds: float
+
+    # Booking lifecycle sweep (services/booking_lifecycle.py): every interval, one worker
+    # expires bookings left pending longer than the TTL and completes past confirmed stays
+    booking_lifecycle_enabled: bool
+    booking_lifecycle_interval_seconds: float
+    booking_pending_ttl_minutes: int
+    booking_lifecycle_batch_size: int
+
+    # How long a resolved principal may be served without going back to the users table.
+    # 0 disables the cache.
+    principal_cache_ttl_seconds: float
+    principal_cache_max_entries: int
+
+    # Argon2 cost parameters. Raising them makes new hashes (and outdated ones, on the
+    # owner's next login) more expensive to compute.
+    argon2_time_cost: int
+    argon2_memory_cost: int  # KiB
+    argon2_parallelism: int
+    # Size of each web worker's hashing process pool; 0 hashes inline in the calling thread.
+    # The default splits the CPUs between the WEB_CONCURRENCY workers (at least one each).
+    password_hash_workers: int
+
+    room_response_cache_ttl_seconds: float
+    room_response_cache_max_entries: int
+    # Room writes made by other workers reach the in-process records after at most this long
+    room_catalog_max_age_seconds: float
+
+    # Local directory shared by the workers' metrics (see utils/metrics.py); empty = single process
+    prometheus_multiproc_dir: str
+
+    # Production server (gunicorn.conf.py). WEB_CONCURRENCY workers, default one per CPU;
+    # each is recycled after about max_requests requests (plus up to jitter, so they don't
+    # all restart at once). Workers silent for longer than timeout are killed and respawned;
+    # on shutdown or restart they get graceful_timeout to finish in-flight requests.
+    web_bind: str
+    web_workers: int
+    web_max_requests: int
+    web_max_requests_jitter: int
+    web_timeout: int
+    web_graceful_timeout: int
+    web_keepalive: int
+
+    # Request profiling (utils/profiling.py). Off: the middleware isn't even installed.
+    # On: requests from admins sending `X-Profile: 1`, plus a random profile_sample_rate
+    # share of all requests, are profiled into a ring of profile_max_entries on disk.
+    profiling_enabled: bool
+    profile_sample_rate: float
+    profile_dir: str
+    profile_max_entries: int
+    profile_interval_ms: float
+
+    # Logging (utils/structured_log.py): the root level, levels per logger name
+    # ({"sql": "WARNING", "services.booking_service": "DEBUG"}), and the share of INFO/DEBUG
+    # records kept per logger name for high-volume loggers ({"routers.users_router": 0.1})
+    log_level: str
+    log_levels: Dict[str, str]
+    log_sample_rates: Dict[str, float]
+    log_format: str
+    # Records waiting for the writer thread; past this they are dropped, never waited on
+    log_queue_size: int
+
+    sql_stats_enabled: bool
+    # Statements slower than this go to the slow-query log
+    slow_query_ms: float
+    # A request running the same statement this many times is logged as a likely N+1
+    sql_repeat_warn_threshold: int
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str]) -> "Settings":
+        """Read and validate every setting; raises SettingsError listing all the problems"""
+        env = _EnvReader(environ)
+
+        database_url = env.string("DATABASE_URL")
+        async_database_url = env.string("ASYNC_DATABASE_URL")
+        if not database_url or not async_database_url:
+            missing = [name for name in ("DB_USERNAME", "DB_HOST", "DB_NAME") if not env.string(name)]
+            if missing:
+                env.errors.append(f"DATABASE_URL is not set and neither is {', '.join(missing)}")
+            credentials = f"{env.string('DB_USERNAME')}:{urllib.parse.quote(env.string('DB_PASSWORD', ''))}"
+            location = f"{env.string('DB_HOST')}:{env.string('DB_PORT', '3306')}/{env.string('DB_NAME')}"
+            database_url = database_url or f"mysql+pymysql://{credentials}@{location}"
+            async_database_url = async_database_url or \
+                f"mysql+{env.string('DB_ASYNC_DRIVER', 'aiomysql')}://{credentials}@{location}"
+
+        secret_key = env.string("SECRET_KEY")
+        if not secret_key:
+            env.errors.append("SECRET_KEY is not set")
+
+        web_workers = env.integer("WEB_CONCURRENCY", os.cpu_count() or 1, minimum=1)
+        settings = cls(
+            database_url=database_url,
+            async_database_url=async_database_url,
+            db_replica_urls=env.strings("DB_REPLICA_URLS"),
+            async_db_replica_urls=env.strings("ASYNC_DB_REPLICA_URLS"),
+            db_read_your_writes_seconds=env.decimal("DB_READ_YOUR_WRITES_SECONDS", 5),
+            db_async=env.flag("DB_ASYNC", False),
+            db_pool_size=env.integer("DB_POOL_SIZE", 5),
+            db_max_overflow=env.integer("DB_MAX_OVERFLOW", 10),
+            db_pool_timeout=env.decimal("DB_POOL_TIMEOUT", 30),
+            db_pool_recycle=env.integer("DB_POOL_RECYCLE", 1800, minimum=-1),
+            db_pool_pre_ping=env.flag("DB_POOL_PRE_PING", True),
+            db_pool_use_lifo=env.flag("DB_POOL_USE_LIFO", False),
+            db_create_all=env.flag("DB_CREATE_ALL", False),
+            db_schema_check=env.choice("DB_SCHEMA_CHECK", "warn", SCHEMA_CHECK_MODES),
+            secret_key=secret_key,
+            algorithm=env.string("ALGORITHM", "HS256"),
+            access_token_expire_minutes=env.integer("ACCESS_TOKEN_EXPIRE_MINUTES", 30, minimum=1),
+            booking_index_enabled=env.flag("BOOKING_INDEX_ENABLED", False),
+            booking_index_max_age_seconds=env.decimal("BOOKING_INDEX_MAX_AGE_SECONDS", 300),
+            booking_lifecycle_enabled=env.flag("BOOKING_LIFECYCLE_ENABLED", True),
+            booking_lifecycle_interval_seconds=env.decimal("BOOKING_LIFECYCLE_INTERVAL_SECONDS", 60, minimum=1),
+            booking_pending_ttl_minutes=env.integer("BOOKING_PENDING_TTL_MINUTES", 1440, minimum=1),
+            booking_lifecycle_batch_size=env.integer("BOOKING_LIFECYCLE_BATCH_SIZE", 500, minimum=1),
+            principal_cache_ttl_seconds=env.decimal("PRINCIPAL_CACHE_TTL_SECONDS", 30),
+            principal_cache_max_entries=env.integer("PRINCIPAL_CACHE_MAX_ENTRIES", 10000),
+            argon2_time_cost=env.integer("ARGON2_TIME_COST", 3, minimum=1),
+            argon2_memory_cost=env.integer("ARGON2_MEMORY_COST", 65536, minimum=8),
+            argon2_parallelism=env.integer("ARGON2_PARALLELISM", 4, minimum=1),
+            password_hash_workers=env.integer("PASSWORD_HASH_WORKERS", max(1, (os.cpu_count() or 1) // web_workers)),
+            room_response_cache_ttl_seconds=env.decimal("ROOM_RESPONSE_CACHE_TTL_SECONDS", 5),
+            room_response_cache_max_entries=env.integer("ROOM_RESPONSE_CACHE_MAX_ENTRIES", 1024),
+            room_catalog_max_age_seconds=env.decimal("ROOM_CATALOG_MAX_AGE_SECONDS", 60),
+            prometheus_multiproc_dir=env.string("PROMETHEUS_MULTIPROC_DIR", ""),
+            web_bind=env.string("GUNICORN_BIND", "0.0.0.0:8000"),
+            web_workers=web_workers,
+            web_max_requests=env.integer("GUNICORN_MAX_REQUESTS", 10000),
+            web_max_requests_jitter=env.integer("GUNICORN_MAX_REQUESTS_JITTER", 1000),
+            web_timeout=env.integer("GUNICORN_TIMEOUT", 60, minimum=1),
+            web_graceful_timeout=env.integer("GUNICORN_GRACEFUL_TIMEOUT", 30),
+            web_keepalive=env.integer("GUNICORN_KEEPALIVE", 5),
+            profiling_enabled=env.flag("PROFILING_ENABLED", False),
+            profile_sample_rate=env.decimal("PROFILE_SAMPLE_RATE", 0, maximum=1),
+            profile_dir=env.string("PROFILE_DIR", os.path.join(tempfile.gettempdir(), "hotel-profiles")),
+            profile_max_entries=env.integer("PROFILE_MAX_ENTRIES", 100, minimum=1),
+            profile_interval_ms=env.decimal("PROFILE_INTERVAL_MS", 1, minimum=0.1),
+            log_level=_log_level(env.choice("LOG_LEVEL", "info", LOG_LEVEL_NAMES)),
+            log_levels=env.pairs("LOG_LEVELS", _log_level),
+            log_sample_rates=env.pairs("LOG_SAMPLE_RATES", _rate),
+            log_format=env.choice("LOG_FORMAT", "json", LOG_FORMATS),
+            log_queue_size=env.integer("LOG_QUEUE_SIZE", 10000, minimum=1),
+            sql_stats_enabled=env.flag("SQL_STATS_ENABLED", True),
+            slow_query_ms=env.decimal("SLOW_QUERY_MS", 200),
+            sql_repeat_warn_threshold=env.integer("SQL_REPEAT_WARN_THRESHOLD", 10, minimum=1),
+        )
+        if env.errors:
+            raise SettingsError("Invalid configuration:\n  " + "\n  ".join(env.errors))
+        return settings
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    The application settings: the .env file (without overriding variables already set)
+    and the environment, read and validated once per process
+    """
+    load_dotenv()
+    return Settings.from_env(os.environ)
@@ -0,0 +1,56 @@
+"""
+Production server: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py
+
+The app is imported once in the master (preload_app), so workers fork with the code
+already loaded and start in milliseconds. Nothing connects to the database at import:
+each worker builds its own engines in the lifespan hook after the fork. The uvicorn
+worker uses uvloop and httptools when they are installed (uvicorn[standard]) and falls
+back to asyncio and h11.
+
+Restarts without dropping requests:
+  - kill -HUP <master>      new workers from the preloaded code, then the old ones drain
+                            (settings changes; the code is not reloaded)
+  - kill -USR2 <master>     a new master with the new code, next to the old one; once it
+                            serves, kill -QUIT the old master to drain it (deploys)
+Workers also restart one at a time after GUNICORN_MAX_REQUESTS requests, which bounds
+slow leaks and drift in the per-process caches.
+
+Each worker starts its own pool of PASSWORD_HASH_WORKERS hashing processes, so logins
+can keep workers x PASSWORD_HASH_WORKERS CPUs busy. Its default splits the CPUs between
+the workers; raise one only by lowering the other.
+"""
+from config import get_settings
+import os
+import shutil
+
+settings = get_settings()
+
+wsgi_app = "main:app"
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+bind = settings.web_bind
+workers = settings.web_workers
+max_requests = settings.web_max_requests
+max_requests_jitter = settings.web_max_requests_jitter
+timeout = settings.web_timeout
+graceful_timeout = settings.web_graceful_timeout
+keepalive = settings.web_keepalive
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    # Metric files left by a previous run would be summed into the new one
+    if settings.prometheus_multiproc_dir:
+        shutil.rmtree(settings.prometheus_multiproc_dir, ignore_errors=True)
+        os.makedirs(settings.prometheus_multiproc_dir)
+
+
+def child_exit(server, worker):
+    from utils.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
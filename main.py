@@ -1,21 +1,86 @@
-from fastapi import FastAPI
-from routers import users_router, rooms_router, booking_router
-from database import engine, Base
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from routers import (
+    users_router, rooms_router, booking_router, reports_router, internal_router,
+    async_users_router, async_rooms_router, async_booking_router
+)
+from config import get_settings
+from database import (
+    Base, DB_ASYNC, READ_REPLICA_URLS, ASYNC_READ_REPLICA_URLS, dispose_engines, get_async_engine,
+    get_async_replica_engines, get_engine, get_replica_engines
+)
+from services import booking_index, booking_lifecycle
+from utils import password_hashing
+from utils.metrics import CONTENT_TYPE_LATEST, PrometheusMiddleware, render_metrics
+from utils import query_stats
+from utils.schema_check import check_schema_at_head
+from utils.read_your_writes import ReadYourWritesMiddleware
+from utils.profiling import PROFILING_ENABLED, ProfilingMiddleware
+from utils.structured_log import RequestIdMiddleware, configure_logging
+
+configure_logging()
 
 # uvicorn main:app --reload
 # https://fastapi.tiangolo.com/features/#validation
 
-Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Importing the app never touches the database: each worker connects here, once spawned
+    settings = get_settings()
+    engine = get_engine()
+    get_replica_engines()
+    if DB_ASYNC:
+        get_async_engine()
+        get_async_replica_engines()
+    if settings.db_create_all:
+        Base.metadata.create_all(bind=engine)
+    elif settings.db_schema_check != "off":
+        check_schema_at_head(engine, strict=settings.db_schema_check == "strict")
+    booking_index.warm_up()
+    booking_lifecycle.start()
+    yield
+    await booking_lifecycle.stop()
+    password_hashing.shutdown()
+    await dispose_engines()
+
+
 app = FastAPI(
     title="Hotel Management System",  # Set the title of the Swagger UI
     description="This is a Hotel Management System.",  # Set the description
     version="1.0.0",  # Set the version
     docs_url="/api/docs",  # Optional: Change the URL for the Swagger documentation
-    redoc_url="/api/redoc"  # Optional: Change the URL for Redoc documentation
+    redoc_url="/api/redoc",  # Optional: Change the URL for Redoc documentation
+    lifespan=lifespan
 )
-app.include_router(users_router.router)
-app.include_router(rooms_router.router)
-app.include_router(booking_router.router)
+
+query_stats.install()
+app.add_middleware(query_stats.QueryStatsMiddleware)
+app.add_middleware(PrometheusMiddleware)
+if READ_REPLICA_URLS or ASYNC_READ_REPLICA_URLS:
+    app.add_middleware(ReadYourWritesMiddleware)
+# Around the other middleware, so a profile covers the whole request; not installed at all when disabled
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+# Outermost: whatever any other layer logs carries the request id
+app.add_middleware(RequestIdMiddleware)
+
+# DB_ASYNC picks the stack serving users/rooms/bookings so both can be benchmarked
+if DB_ASYNC:
+    app.include_router(async_users_router.router)
+    app.include_router(async_rooms_router.router)
+    app.include_router(async_booking_router.router)
+else:
+    app.include_router(users_router.router)
+    app.include_router(rooms_router.router)
+    app.include_router(booking_router.router)
+app.include_router(reports_router.router)
+app.include_router(internal_router.router)
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.get("/")
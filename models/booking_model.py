@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from models.rooms_model import RoomSummary
+from models.user_model import User
 
 
 # ----- Base schema -----
@@ -39,3 +41,41 @@ class Booking(BookingBase):
 
     class Config:
         orm_mode = True
+
+
+# ----- List item schema (response): Booking without the notes text -----
+class BookingSummary(BaseModel):
+    id: int
+    room_id: int
+    user_id: Optional[int] = None
+    check_in: datetime
+    check_out: datetime
+    guests: int
+    total_price: float
+    status: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    created_by: Optional[int] = None
+    # Only present with ?expand=
+    room: Optional[RoomSummary] = None
+    user: Optional[User] = None
+
+
+# ----- Expanded read schema (response) -----
+class BookingExpanded(Booking):
+    # Only present with ?expand=
+    room: Optional[RoomSummary] = None
+    user: Optional[User] = None
+
+
+# ----- Page schema (response) -----
+class BookingPage(BaseModel):
+    items: List[BookingSummary]
+    next_cursor: Optional[str] = None
+
+
+# ----- Bulk create result schema (response) -----
+class BookingBulkResult(BaseModel):
+    index: int
+    booking: Optional[Booking] = None
+    error: Optional[str] = None
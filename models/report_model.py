@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+from datetime import date
+from models.rooms_model import RoomType
+
+
+class OccupancyStat(BaseModel):
+    date: date
+    room_type: RoomType
+    rooms_sold: int
+    rooms_total: int
+    occupancy_percent: float
+
+
+class RevenueStat(BaseModel):
+    date: date
+    room_type: RoomType
+    rooms_sold: int
+    revenue: float
+    adr: float  # Average daily rate: revenue per sold room-night
+    revpar: float  # Revenue per available room
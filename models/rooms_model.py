@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -48,3 +48,34 @@ class Room(RoomBase):
 
     class Config:
         orm_mode = True
+
+
+# ----- List item schema (response): Room without the description text -----
+class RoomSummary(BaseModel):
+    id: int
+    room_number: str
+    floor: Optional[int] = None
+    type: RoomType
+    price_per_night: float
+    currency: str
+    capacity: int
+    is_available: bool
+    is_under_maintenance: bool
+    has_offer: Optional[bool] = None
+    discount_percent: Optional[float] = None
+    created_by: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+# ----- Page schema (response) -----
+class RoomPage(BaseModel):
+    items: List[RoomSummary]
+    next_cursor: Optional[str] = None
+
+
+# ----- Search result schema (response) -----
+class RoomSearchResult(Room):
+    effective_price_per_night: float
+    nights: int
+    total_price: float
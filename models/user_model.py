@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from typing import List, Optional
+from datetime import datetime
 
 from enum import Enum
 
@@ -33,3 +34,25 @@ class UserUpdate(BaseModel):
     last_name: Optional[str] = None
     email: Optional[str] = None
     password: Optional[str] = None
+
+
+# ----- Read schema (response): everything but the password hash -----
+class User(BaseModel):
+    id: int
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    role: UserRole
+    created_on: datetime
+    created_by: Optional[int] = None
+    updated_on: Optional[datetime] = None
+    updated_by: Optional[int] = None
+
+    class Config:
+        orm_mode = True
+
+
+# ----- Page schema (response) -----
+class UserPage(BaseModel):
+    items: List[User]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,212 @@
+"""Async twin of booking_router, mounted instead of it when DB_ASYNC=true"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database import get_async_db, get_async_read_db
+from models.booking_model import Booking, BookingCreate, BookingUpdate, BookingBulkResult, BookingPage, BookingExpanded
+from services import async_booking_service, booking_service
+from utils.auth import get_current_user_async
+from utils.pagination import MAX_PAGE_SIZE
+from utils.fast_json import FastJSONResponse
+
+router = APIRouter(
+    prefix="/bookings",
+    tags=["Bookings"]
+)
+
+
+@router.post("/", response_model=Booking, status_code=status.HTTP_201_CREATED)
+async def create_booking(booking: BookingCreate, db: AsyncSession = Depends(get_async_db),
+                         current_user_data: dict = Depends(get_current_user_async)):
+    """
+    Create a new booking
+    - Validates room availability
+    - Checks for date conflicts
+    - Validates guest capacity
+    """
+    return await async_booking_service.create_booking(db, booking, current_user_data)
+
+
+@router.post("/bulk", response_model=List[BookingBulkResult], status_code=status.HTTP_201_CREATED)
+async def create_bookings_bulk(bookings: List[BookingCreate], db: AsyncSession = Depends(get_async_db),
+                               current_user_data: dict = Depends(get_current_user_async)):
+    """
+    Create a group of bookings in one all-or-nothing transaction
+    - Loads every referenced room and checks every stay in one query each
+    - Rejects the whole group when any item is invalid, with per-item errors
+    """
+    return await async_booking_service.create_bookings_bulk(db, bookings, current_user_data)
+
+
+@router.get("/", response_model=BookingPage, response_model_exclude_unset=True)
+async def get_all_bookings(
+        cursor: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+        status: Optional[str] = None,
+        user_id: Optional[int] = None,
+        fields: Optional[str] = None,
+        expand: Optional[str] = None,
+        db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Retrieve bookings ordered by check-in date, with optional filters
+    - **cursor**: `next_cursor` of the previous page (omit for the first page)
+    - **limit**: Maximum number of records to return
+    - **status**: Filter by booking status (pending, confirmed, cancelled)
+    - **user_id**: Filter by user ID
+    - **fields**: Comma-separated fields to return, e.g. `id,room_id,check_in` (default: all but notes)
+    - **expand**: Comma-separated relations to embed: room, user (not with fields)
+    """
+    items, next_cursor = await async_booking_service.get_all_bookings(db, cursor, limit, status, user_id, fields, expand)
+    # Projected rows go out as selected (sparse ones wouldn't fit BookingPage anyway)
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+@router.get("/export")
+async def export_bookings(
+        format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+        status: Optional[str] = None,
+        user_id: Optional[int] = None,
+        _: dict = Depends(get_current_user_async)
+):
+    """
+    Stream the booking history as NDJSON or CSV
+    - **format**: ndjson (default) or csv
+    - **status**: Filter by booking status
+    - **user_id**: Filter by user ID
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    # The export opens its own sync session and is iterated in the threadpool
+    return StreamingResponse(
+        booking_service.export_bookings(format, status, user_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=bookings.{format}"}
+    )
+
+
+@router.get("/upcoming", response_model=List[BookingExpanded], response_model_exclude_unset=True)
+async def get_upcoming_bookings(
+        user_id: Optional[int] = None,
+        expand: Optional[str] = None,
+        db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get upcoming bookings (check-in date in the future)
+    - **user_id**: Optional filter by user ID
+    - **expand**: Comma-separated relations to embed: room, user
+    """
+    return FastJSONResponse(await async_booking_service.get_upcoming_bookings(db, user_id, expand))
+
+
+@router.get("/active", response_model=List[BookingExpanded], response_model_exclude_unset=True)
+async def get_active_bookings(expand: Optional[str] = None, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Get currently active bookings (guests currently checked in)
+    - **expand**: Comma-separated relations to embed: room, user
+    """
+    return FastJSONResponse(await async_booking_service.get_active_bookings(db, expand))
+
+
+@router.get("/user/{user_id}", response_model=List[BookingExpanded], response_model_exclude_unset=True)
+async def get_user_bookings(user_id: int, expand: Optional[str] = None, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Get all bookings for a specific user
+    - **expand**: Comma-separated relations to embed: room, user
+    """
+    return FastJSONResponse(await async_booking_service.get_user_bookings(db, user_id, expand))
+
+
+@router.get("/room/{room_id}", response_model=List[BookingExpanded], response_model_exclude_unset=True)
+async def get_room_bookings(room_id: int, expand: Optional[str] = None, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Get all bookings for a specific room
+    - **expand**: Comma-separated relations to embed: room, user
+    """
+    return FastJSONResponse(await async_booking_service.get_room_bookings(db, room_id, expand))
+
+
+@router.get("/{booking_id}", response_model=Booking)
+async def get_booking_by_id(booking_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Retrieve a specific booking by ID
+    """
+    booking = await async_booking_service.get_booking_by_id(db, booking_id)
+
+    if not booking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Booking with id {booking_id} not found"
+        )
+
+    return booking
+
+
+@router.put("/{booking_id}", response_model=Booking)
+async def update_booking(
+        booking_id: int,
+        booking_update: BookingUpdate,
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update booking details
+    - Validates new dates for conflicts
+    - Checks guest capacity if changed
+    """
+    booking = await async_booking_service.update_booking(db, booking_id, booking_update)
+
+    if not booking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Booking with id {booking_id} not found"
+        )
+
+    return booking
+
+
+@router.delete("/{booking_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_booking(booking_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Permanently delete a booking by ID
+    """
+    success = await async_booking_service.delete_booking(db, booking_id)
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Booking with id {booking_id} not found"
+        )
+
+    return None
+
+
+@router.patch("/{booking_id}/cancel", response_model=Booking)
+async def cancel_booking(booking_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Cancel a booking (soft delete - changes status to 'cancelled')
+    """
+    booking = await async_booking_service.cancel_booking(db, booking_id)
+
+    if not booking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Booking with id {booking_id} not found"
+        )
+
+    return booking
+
+
+@router.patch("/{booking_id}/confirm", response_model=Booking)
+async def confirm_booking(booking_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Confirm a pending booking
+    """
+    booking = await async_booking_service.confirm_booking(db, booking_id)
+
+    if not booking:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Booking with id {booking_id} not found"
+        )
+
+    return booking
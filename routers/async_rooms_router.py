@@ -0,0 +1,185 @@
+"""Async twin of rooms_router, mounted instead of it when DB_ASYNC=true"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime
+from database import get_async_db, get_async_read_db
+from models.rooms_model import Room, RoomBase, RoomUpdate, RoomPage, RoomSearchResult, RoomType
+from services import async_room_service, room_catalog, room_service
+from utils.auth import get_current_user_async
+from utils.pagination import MAX_PAGE_SIZE
+from utils.http_cache import cached_response, store_response
+from utils.fast_json import FastJSONResponse
+
+router = APIRouter(
+    prefix="/rooms",
+    tags=["Rooms"]
+)
+
+
+@router.post("/", response_model=Room, status_code=status.HTTP_201_CREATED)
+async def create_room(room: RoomBase, db: AsyncSession = Depends(get_async_db), current_user_data: dict = Depends(get_current_user_async)):
+    """
+    Create a new room in the hotel
+    """
+    return await async_room_service.create_room(db, room, current_user_data)
+
+
+@router.get("/", response_model=RoomPage)
+async def get_all_rooms(
+        request: Request,
+        cursor: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+        is_available: Optional[bool] = None,
+        room_type: Optional[str] = None,
+        fields: Optional[str] = None,
+        db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Retrieve rooms ordered by room number, with optional filters
+    - **cursor**: `next_cursor` of the previous page (omit for the first page)
+    - **limit**: Maximum number of records to return
+    - **is_available**: Filter by availability status
+    - **room_type**: Filter by room type
+    - **fields**: Comma-separated fields to return, e.g. `id,room_number,price_per_night` (default: all but description)
+    Responses carry an ETag; send it back in `If-None-Match` to get a 304
+    """
+    version = room_catalog.version()
+    cached = cached_response(room_catalog.response_cache, request, version)
+    if cached:
+        return cached
+
+    items, next_cursor = await async_room_service.get_all_rooms(db, cursor, limit, is_available, room_type, fields)
+    return store_response(room_catalog.response_cache, request, version, {"items": items, "next_cursor": next_cursor})
+
+
+@router.get("/available", response_model=List[Room])
+async def get_available_rooms(request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Retrieve only available rooms (not under maintenance and available for booking)
+    Responses carry an ETag; send it back in `If-None-Match` to get a 304
+    """
+    version = room_catalog.version()
+    cached = cached_response(room_catalog.response_cache, request, version)
+    if cached:
+        return cached
+
+    rooms = await async_room_service.get_available_rooms(db)
+    return store_response(
+        room_catalog.response_cache, request, version, [room_service.room_to_dict(room) for room in rooms]
+    )
+
+
+@router.get("/search", response_model=List[RoomSearchResult])
+async def search_available_rooms(
+        check_in: datetime,
+        check_out: datetime,
+        guests: int = Query(1, ge=1),
+        room_type: Optional[RoomType] = Query(None, alias="type"),
+        db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Find rooms that are free for a whole date range
+    - **check_in** / **check_out**: Requested stay
+    - **guests**: Minimum room capacity
+    - **type**: Filter by room type
+    Results are ranked by closest capacity fit, then by price after discount
+    """
+    return FastJSONResponse(await async_room_service.search_available_rooms(
+        db, check_in, check_out, guests, room_type.value if room_type else None
+    ))
+
+
+@router.get("/{room_id}", response_model=Room)
+async def get_room_by_id(room_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    """
+    Retrieve a specific room by ID
+    Responses carry an ETag; send it back in `If-None-Match` to get a 304
+    """
+    version = room_catalog.version()
+    cached = cached_response(room_catalog.response_cache, request, version)
+    if cached:
+        return cached
+
+    room = await async_room_service.get_room_by_id(db, room_id)
+
+    if not room:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Room with id {room_id} not found"
+        )
+
+    return store_response(room_catalog.response_cache, request, version, Room(**room_service.room_to_dict(room)))
+
+
+@router.put("/{room_id}", response_model=Room)
+async def update_room(room_id: int, room_update: RoomUpdate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Update room details
+    """
+    room = await async_room_service.update_room(db, room_id, room_update)
+
+    if not room:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Room with id {room_id} not found"
+        )
+
+    return room
+
+
+@router.delete("/{room_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_room(room_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Delete a room by ID
+    """
+    success = await async_room_service.delete_room(db, room_id)
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Room with id {room_id} not found"
+        )
+
+    return None
+
+
+@router.patch("/{room_id}/availability", response_model=Room)
+async def update_room_availability(
+        room_id: int,
+        is_available: bool,
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update room availability status
+    """
+    room = await async_room_service.update_room_availability(db, room_id, is_available)
+
+    if not room:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Room with id {room_id} not found"
+        )
+
+    return room
+
+
+@router.patch("/{room_id}/maintenance", response_model=Room)
+async def set_room_maintenance(
+        room_id: int,
+        under_maintenance: bool,
+        db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Set room maintenance status
+    When set to maintenance, room automatically becomes unavailable
+    """
+    room = await async_room_service.set_room_maintenance(db, room_id, under_maintenance)
+
+    if not room:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Room with id {room_id} not found"
+        )
+
+    return room
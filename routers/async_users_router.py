@@ -0,0 +1,69 @@
+"""Async twin of users_router, mounted instead of it when DB_ASYNC=true"""
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_async_db, get_async_read_db
+from utils.auth import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, verify_token
+from datetime import timedelta
+from typing import Optional
+from models.user_model import UserCreate, LoginRequest, Token, UserUpdate, User, UserPage
+from utils.pagination import MAX_PAGE_SIZE
+from services.async_user_service import (
+    get_all_users,
+    get_user_by_id,
+    create_user,
+    update_user,
+    authenticate_user_service
+)
+import logging
+
+log = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/users", tags=["Users"])
+
+
+@router.get("/", response_model=UserPage)
+async def read_users(cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+                     fields: Optional[str] = None, db: AsyncSession = Depends(get_async_read_db), _: str = Depends(verify_token)):
+    users, next_cursor = await get_all_users(db, cursor, limit, fields)
+    if fields:
+        return JSONResponse(jsonable_encoder({"items": users, "next_cursor": next_cursor}))
+    return {"items": users, "next_cursor": next_cursor}
+
+
+@router.get("/{id}", response_model=User)
+async def read_user(id: int, db: AsyncSession = Depends(get_async_read_db), _: str = Depends(verify_token)):
+    user = await get_user_by_id(db, id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+@router.post("/", response_model=User)
+async def add_user(user: UserCreate, db: AsyncSession = Depends(get_async_db), _: str = Depends(verify_token)):
+    return await create_user(db, user)
+
+
+@router.put("/{id}", response_model=User)
+async def modify_user(id: int, user: UserUpdate, db: AsyncSession = Depends(get_async_db), _: str = Depends(verify_token)):
+    updated_user = await update_user(db, id, user)
+    if not updated_user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return updated_user
+
+
+@router.post("/login", response_model=Token)
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user_service(db, data.email, data.password)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password"
+        )
+    log.info("login succeeded", extra={"user_id": user.id})
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": data.email, "role": user.role}, expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
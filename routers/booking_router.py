@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from database import get_db
-from models.booking_model import Booking, BookingCreate, BookingUpdate
+from database import get_db, get_read_db
+from models.booking_model import Booking, BookingCreate, BookingUpdate, BookingBulkResult, BookingPage, BookingExpanded
 from services import booking_service
 from utils.auth import get_current_user
+from utils.pagination import MAX_PAGE_SIZE
+from utils.fast_json import FastJSONResponse
 
 router = APIRouter(
     prefix="/bookings",
@@ -24,62 +27,105 @@ def create_booking(booking: BookingCreate, db: Session = Depends(get_db),
     return booking_service.create_booking(db, booking, current_user_data)
 
 
-@router.get("/", response_model=List[Booking])
+@router.post("/bulk", response_model=List[BookingBulkResult], status_code=status.HTTP_201_CREATED)
+def create_bookings_bulk(bookings: List[BookingCreate], db: Session = Depends(get_db),
+                         current_user_data: dict = Depends(get_current_user)):
+    """
+    Create a group of bookings in one all-or-nothing transaction
+    - Loads every referenced room and checks every stay in one query each
+    - Rejects the whole group when any item is invalid, with per-item errors
+    """
+    return booking_service.create_bookings_bulk(db, bookings, current_user_data)
+
+
+@router.get("/", response_model=BookingPage, response_model_exclude_unset=True)
 def get_all_bookings(
-        skip: int = 0,
-        limit: int = 100,
+        cursor: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
         status: Optional[str] = None,
         user_id: Optional[int] = None,
-        db: Session = Depends(get_db)
+        fields: Optional[str] = None,
+        expand: Optional[str] = None,
+        db: Session = Depends(get_read_db)
 ):
     """
-    Retrieve all bookings with optional filters
-    - **skip**: Number of records to skip (pagination)
+    Retrieve bookings ordered by check-in date, with optional filters
+    - **cursor**: `next_cursor` of the previous page (omit for the first page)
     - **limit**: Maximum number of records to return
     - **status**: Filter by booking status (pending, confirmed, cancelled)
     - **user_id**: Filter by user ID
+    - **fields**: Comma-separated fields to return, e.g. `id,room_id,check_in` (default: all but notes)
+    - **expand**: Comma-separated relations to embed: room, user (not with fields)
+    """
+    items, next_cursor = booking_service.get_all_bookings(db, cursor, limit, status, user_id, fields, expand)
+    # Projected rows go out as selected (sparse ones wouldn't fit BookingPage anyway)
+    return FastJSONResponse({"items": items, "next_cursor": next_cursor})
+
+
+@router.get("/export")
+def export_bookings(
+        format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+        status: Optional[str] = None,
+        user_id: Optional[int] = None,
+        _: dict = Depends(get_current_user)
+):
+    """
+    Stream the booking history as NDJSON or CSV
+    - **format**: ndjson (default) or csv
+    - **status**: Filter by booking status
+    - **user_id**: Filter by user ID
     """
-    return booking_service.get_all_bookings(db, skip, limit, status, user_id)
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        booking_service.export_bookings(format, status, user_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=bookings.{format}"}
+    )
 
 
-@router.get("/upcoming", response_model=List[Booking])
+@router.get("/upcoming", response_model=List[BookingExpanded], response_model_exclude_unset=True)
 def get_upcoming_bookings(
         user_id: Optional[int] = None,
-        db: Session = Depends(get_db)
+        expand: Optional[str] = None,
+        db: Session = Depends(get_read_db)
 ):
     """
     Get upcoming bookings (check-in date in the future)
     - **user_id**: Optional filter by user ID
+    - **expand**: Comma-separated relations to embed: room, user
     """
-    return booking_service.get_upcoming_bookings(db, user_id)
+    return FastJSONResponse(booking_service.get_upcoming_bookings(db, user_id, expand))
 
 
-@router.get("/active", response_model=List[Booking])
-def get_active_bookings(db: Session = Depends(get_db)):
+@router.get("/active", response_model=List[BookingExpanded], response_model_exclude_unset=True)
+def get_active_bookings(expand: Optional[str] = None, db: Session = Depends(get_read_db)):
     """
     Get currently active bookings (guests currently checked in)
+    - **expand**: Comma-separated relations to embed: room, user
     """
-    return booking_service.get_active_bookings(db)
+    return FastJSONResponse(booking_service.get_active_bookings(db, expand))
 
 
-@router.get("/user/{user_id}", response_model=List[Booking])
-def get_user_bookings(user_id: int, db: Session = Depends(get_db)):
+@router.get("/user/{user_id}", response_model=List[BookingExpanded], response_model_exclude_unset=True)
+def get_user_bookings(user_id: int, expand: Optional[str] = None, db: Session = Depends(get_read_db)):
     """
     Get all bookings for a specific user
+    - **expand**: Comma-separated relations to embed: room, user
     """
-    return booking_service.get_user_bookings(db, user_id)
+    return FastJSONResponse(booking_service.get_user_bookings(db, user_id, expand))
 
 
-@router.get("/room/{room_id}", response_model=List[Booking])
-def get_room_bookings(room_id: int, db: Session = Depends(get_db)):
+@router.get("/room/{room_id}", response_model=List[BookingExpanded], response_model_exclude_unset=True)
+def get_room_bookings(room_id: int, expand: Optional[str] = None, db: Session = Depends(get_read_db)):
     """
     Get all bookings for a specific room
+    - **expand**: Comma-separated relations to embed: room, user
     """
-    return booking_service.get_room_bookings(db, room_id)
+    return FastJSONResponse(booking_service.get_room_bookings(db, room_id, expand))
 
 
 @router.get("/{booking_id}", response_model=Booking)
-def get_booking_by_id(booking_id: int, db: Session = Depends(get_db)):
+def get_booking_by_id(booking_id: int, db: Session = Depends(get_read_db)):
     """
     Retrieve a specific booking by ID
     """
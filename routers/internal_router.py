@@ -0,0 +1,62 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse
+from utils.auth import require_admin
+from utils.db_metrics import get_pool_metrics
+from utils.principal_cache import principal_cache
+from utils.profiling import profile_store
+from utils.structured_log import dropped_records
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["Internal"],
+    dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/db-pool")
+def get_db_pool():
+    """
+    Connection pool utilisation, checkout/checkin counters and checkout wait-time
+    percentiles (over the most recent checkouts) for this worker process
+    """
+    return {"pools": get_pool_metrics()}
+
+
+@router.get("/principal-cache")
+def get_principal_cache_stats():
+    """
+    Size and hit/miss counters of the authenticated-principal cache in this worker process
+    """
+    return principal_cache.stats()
+
+
+@router.get("/logging")
+def get_logging_stats():
+    """
+    Log records this worker process dropped because the log writer fell behind
+    """
+    return {"dropped_records": dropped_records()}
+
+
+@router.get("/profiles")
+def list_profiles(route: Optional[str] = None, limit: int = Query(50, ge=1, le=500)):
+    """
+    Most recent request profiles (all workers), newest first. Needs PROFILING_ENABLED.
+
+    - **route**: only profiles of this route template, e.g. `/bookings/{booking_id}`
+    - **limit**: how many to return
+    """
+    return {"profiles": profile_store.list(limit, route)}
+
+
+@router.get("/profiles/{profile_id}")
+def download_profile(profile_id: str):
+    """
+    Download the collapsed stacks of one profile, for flamegraph.pl or speedscope.
+
+    - **profile_id**: the id from /internal/profiles or the X-Profile-Id response header
+    """
+    return FileResponse(
+        profile_store.path(profile_id), media_type="text/plain", filename=f"{profile_id}.collapsed"
+    )
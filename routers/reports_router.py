@@ -0,0 +1,47 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from datetime import date
+from database import get_db
+from models.report_model import OccupancyStat, RevenueStat
+from models.rooms_model import RoomType
+from services import report_service
+from utils.auth import get_current_user
+
+router = APIRouter(
+    prefix="/reports",
+    tags=["Reports"]
+)
+
+
+@router.get("/occupancy", response_model=List[OccupancyStat])
+def get_occupancy_report(
+        start: date,
+        end: date,
+        room_type: Optional[RoomType] = None,
+        db: Session = Depends(get_db),
+        _: dict = Depends(get_current_user)
+):
+    """
+    Occupancy per day and room type, read from the daily rollup
+    - **start** / **end**: Inclusive date range (at most 366 days)
+    - **room_type**: Filter by room type
+    """
+    return report_service.get_occupancy_report(db, start, end, room_type.value if room_type else None)
+
+
+@router.get("/revenue", response_model=List[RevenueStat])
+def get_revenue_report(
+        start: date,
+        end: date,
+        room_type: Optional[RoomType] = None,
+        db: Session = Depends(get_db),
+        _: dict = Depends(get_current_user)
+):
+    """
+    Revenue, ADR (revenue per sold room-night) and RevPAR (revenue per available room)
+    per day and room type, read from the daily rollup
+    - **start** / **end**: Inclusive date range (at most 366 days)
+    - **room_type**: Filter by room type
+    """
+    return report_service.get_revenue_report(db, start, end, room_type.value if room_type else None)
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from database import get_db
-from models.rooms_model import Room, RoomBase, RoomUpdate
-from services import room_service
+from datetime import datetime
+from database import get_db, get_read_db
+from models.rooms_model import Room, RoomBase, RoomUpdate, RoomPage, RoomSearchResult, RoomType
+from services import room_service, room_catalog
 from utils.auth import get_current_user
+from utils.pagination import MAX_PAGE_SIZE
+from utils.http_cache import cached_response, store_response
+from utils.fast_json import FastJSONResponse
 
 router = APIRouter(
     prefix="/rooms",
@@ -20,37 +24,82 @@ def create_room(room: RoomBase, db: Session = Depends(get_db), current_user_data
     return room_service.create_room(db, room, current_user_data)
 
 
-@router.get("/", response_model=List[Room])
+@router.get("/", response_model=RoomPage)
 def get_all_rooms(
-        skip: int = 0,
-        limit: int = 100,
+        request: Request,
+        cursor: Optional[str] = None,
+        limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
         is_available: Optional[bool] = None,
         room_type: Optional[str] = None,
-        db: Session = Depends(get_db)
+        fields: Optional[str] = None,
+        db: Session = Depends(get_read_db)
 ):
     """
-    Retrieve all rooms with optional filters
-    - **skip**: Number of records to skip (pagination)
+    Retrieve rooms ordered by room number, with optional filters
+    - **cursor**: `next_cursor` of the previous page (omit for the first page)
     - **limit**: Maximum number of records to return
     - **is_available**: Filter by availability status
     - **room_type**: Filter by room type
+    - **fields**: Comma-separated fields to return, e.g. `id,room_number,price_per_night` (default: all but description)
+    Responses carry an ETag; send it back in `If-None-Match` to get a 304
     """
-    return room_service.get_all_rooms(db, skip, limit, is_available, room_type)
+    version = room_catalog.version()
+    cached = cached_response(room_catalog.response_cache, request, version)
+    if cached:
+        return cached
+
+    items, next_cursor = room_service.get_all_rooms(db, cursor, limit, is_available, room_type, fields)
+    return store_response(room_catalog.response_cache, request, version, {"items": items, "next_cursor": next_cursor})
 
 
 @router.get("/available", response_model=List[Room])
-def get_available_rooms(db: Session = Depends(get_db)):
+def get_available_rooms(request: Request, db: Session = Depends(get_read_db)):
     """
     Retrieve only available rooms (not under maintenance and available for booking)
+    Responses carry an ETag; send it back in `If-None-Match` to get a 304
+    """
+    version = room_catalog.version()
+    cached = cached_response(room_catalog.response_cache, request, version)
+    if cached:
+        return cached
+
+    rooms = room_service.get_available_rooms(db)
+    return store_response(
+        room_catalog.response_cache, request, version, [room_service.room_to_dict(room) for room in rooms]
+    )
+
+
+@router.get("/search", response_model=List[RoomSearchResult])
+def search_available_rooms(
+        check_in: datetime,
+        check_out: datetime,
+        guests: int = Query(1, ge=1),
+        room_type: Optional[RoomType] = Query(None, alias="type"),
+        db: Session = Depends(get_read_db)
+):
     """
-    return room_service.get_available_rooms(db)
+    Find rooms that are free for a whole date range
+    - **check_in** / **check_out**: Requested stay
+    - **guests**: Minimum room capacity
+    - **type**: Filter by room type
+    Results are ranked by closest capacity fit, then by price after discount
+    """
+    return FastJSONResponse(room_service.search_available_rooms(
+        db, check_in, check_out, guests, room_type.value if room_type else None
+    ))
 
 
 @router.get("/{room_id}", response_model=Room)
-def get_room_by_id(room_id: int, db: Session = Depends(get_db)):
+def get_room_by_id(room_id: int, request: Request, db: Session = Depends(get_read_db)):
     """
     Retrieve a specific room by ID
+    Responses carry an ETag; send it back in `If-None-Match` to get a 304
     """
+    version = room_catalog.version()
+    cached = cached_response(room_catalog.response_cache, request, version)
+    if cached:
+        return cached
+
     room = room_service.get_room_by_id(db, room_id)
 
     if not room:
@@ -59,7 +108,7 @@ def get_room_by_id(room_id: int, db: Session = Depends(get_db)):
             detail=f"Room with id {room_id} not found"
         )
 
-    return room
+    return store_response(room_catalog.response_cache, request, version, Room(**room_service.room_to_dict(room)))
 
 
 @router.put("/{room_id}", response_model=Room)
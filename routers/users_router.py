@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from database import get_db
+from database import get_db, get_read_db
 from utils.auth import create_access_token, ACCESS_TOKEN_EXPIRE_MINUTES, verify_token
 from datetime import timedelta
-from models.user_model import UserCreate, LoginRequest, Token, UserUpdate
+from typing import Optional
+from models.user_model import UserCreate, LoginRequest, Token, UserUpdate, User, UserPage
+from utils.pagination import MAX_PAGE_SIZE
 from services.user_service import (
     get_all_users,
     get_user_by_id,
@@ -11,30 +15,36 @@ from services.user_service import (
     update_user,
     authenticate_user_service
 )
+import logging
+
+log = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
 
 
-@router.get("/")
-def read_users(db: Session = Depends(get_db), _: str = Depends(verify_token)):
-    users = get_all_users(db)
-    return users or []
+@router.get("/", response_model=UserPage)
+def read_users(cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+               fields: Optional[str] = None, db: Session = Depends(get_read_db), _: str = Depends(verify_token)):
+    users, next_cursor = get_all_users(db, cursor, limit, fields)
+    if fields:
+        return JSONResponse(jsonable_encoder({"items": users, "next_cursor": next_cursor}))
+    return {"items": users, "next_cursor": next_cursor}
 
 
-@router.get("/{id}")
-def read_user(id: int, db: Session = Depends(get_db), _: str = Depends(verify_token)):
+@router.get("/{id}", response_model=User)
+def read_user(id: int, db: Session = Depends(get_read_db), _: str = Depends(verify_token)):
     user = get_user_by_id(db, id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
-@router.post("/")
+@router.post("/", response_model=User)
 def add_user(user: UserCreate, db: Session = Depends(get_db), _: str = Depends(verify_token)):
     return create_user(db, user)
 
 
-@router.put("/{id}")
+@router.put("/{id}", response_model=User)
 def modify_user(id: int, user: UserUpdate, db: Session = Depends(get_db), _: str = Depends(verify_token)):
     updated_user = update_user(db, id, user)
     if not updated_user:
@@ -50,7 +60,7 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password"
         )
-    print('Users:: ', user)
+    log.info("login succeeded", extra={"user_id": user.id})
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": data.email, "role": user.role}, expires_delta=access_token_expires
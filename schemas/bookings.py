@@ -1,6 +1,6 @@
 from sqlalchemy import (
     Column, Integer, String, DateTime, Float, ForeignKey, Boolean, Text,
-    func, UniqueConstraint, CheckConstraint
+    func, CheckConstraint, Index
 )
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -36,5 +36,9 @@ class Bookings(Base):
 
     __table_args__ = (
         CheckConstraint("check_out > check_in", name="check_dates_valid"),
-        UniqueConstraint("room_id", "check_in", "check_out", name="uq_room_booking_period"),
+        # Keyset pagination on (check_in, id), alone or behind the list filters
+        Index("ix_bookings_check_in_id", "check_in", "id"),
+        Index("ix_bookings_room_id_check_in_id", "room_id", "check_in", "id"),
+        Index("ix_bookings_status_check_in_id", "status", "check_in", "id"),
+        Index("ix_bookings_user_id_check_in_id", "user_id", "check_in", "id"),
     )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, Float, Date, Enum
+from database import Base
+from schemas.rooms import RoomType
+
+
+class DailyRoomStats(Base):
+    """Per day and room type rollup of sold room-nights, kept up to date by the booking service"""
+    __tablename__ = "daily_room_stats"
+
+    stat_date = Column(Date, primary_key=True)
+    room_type = Column(Enum(RoomType), primary_key=True)
+    rooms_sold = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0.0)
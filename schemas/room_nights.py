@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from database import Base
+
+
+class RoomNights(Base):
+    """Occupancy ledger: one row per night an active booking holds a room"""
+    __tablename__ = "room_nights"
+
+    # The composite primary key is what rejects overlapping bookings
+    room_id = Column(Integer, ForeignKey("rooms.id", ondelete="CASCADE"), primary_key=True)
+    night = Column(Date, primary_key=True)
+    booking_id = Column(Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False, index=True)
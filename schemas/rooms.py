@@ -49,4 +49,7 @@ class Rooms(Base):
     __table_args__ = (
         UniqueConstraint("room_number", name="uq_room_room_number"),
         Index("ix_room_type_availability", "type", "is_available"),
+        # Keyset pagination on (room_number, id) behind the list filters
+        Index("ix_rooms_available_room_number_id", "is_available", "room_number", "id"),
+        Index("ix_rooms_type_room_number_id", "type", "room_number", "id"),
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Enum as SqlEnum, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Boolean, Enum as SqlEnum, DateTime, ForeignKey, Index, func
 from database import Base
 from enum import Enum
 from sqlalchemy.orm import relationship
@@ -25,3 +25,8 @@ class Users(Base):
     updated_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     # Back-reference for rooms created by this user
     rooms_created = relationship("Rooms", back_populates="created_by_user")
+
+    __table_args__ = (
+        # Keyset pagination on (created_on, id)
+        Index("ix_users_created_on_id", "created_on", "id"),
+    )
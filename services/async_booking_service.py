@@ -0,0 +1,71 @@
+"""
+Async versions of booking_service for the async stack (DB_ASYNC=true).
+Each function runs the sync service on the AsyncSession's greenlet through run_sync:
+the business rules stay in one place while every query goes through the asyncio
+driver, so request handlers never hold a threadpool thread.
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.bookings import Bookings
+from models.booking_model import BookingCreate, BookingUpdate
+from services import booking_service
+from typing import List, Optional, Tuple
+
+
+async def get_all_bookings(
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        status: Optional[str] = None,
+        user_id: Optional[int] = None,
+        fields: Optional[str] = None,
+        expand: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    return await db.run_sync(booking_service.get_all_bookings, cursor, limit, status, user_id, fields, expand)
+
+
+async def get_booking_by_id(db: AsyncSession, booking_id: int) -> Optional[Bookings]:
+    return await db.run_sync(booking_service.get_booking_by_id, booking_id)
+
+
+async def create_booking(db: AsyncSession, booking: BookingCreate, current_user_data: dict) -> Bookings:
+    return await db.run_sync(booking_service.create_booking, booking, current_user_data)
+
+
+async def create_bookings_bulk(db: AsyncSession, bookings: List[BookingCreate], current_user_data: dict) -> List[dict]:
+    return await db.run_sync(booking_service.create_bookings_bulk, bookings, current_user_data)
+
+
+async def update_booking(db: AsyncSession, booking_id: int, booking_update: BookingUpdate) -> Optional[Bookings]:
+    return await db.run_sync(booking_service.update_booking, booking_id, booking_update)
+
+
+async def delete_booking(db: AsyncSession, booking_id: int) -> bool:
+    return await db.run_sync(booking_service.delete_booking, booking_id)
+
+
+async def cancel_booking(db: AsyncSession, booking_id: int) -> Optional[Bookings]:
+    return await db.run_sync(booking_service.cancel_booking, booking_id)
+
+
+async def confirm_booking(db: AsyncSession, booking_id: int) -> Optional[Bookings]:
+    return await db.run_sync(booking_service.confirm_booking, booking_id)
+
+
+async def get_user_bookings(db: AsyncSession, user_id: int, expand: Optional[str] = None) -> List[dict]:
+    return await db.run_sync(booking_service.get_user_bookings, user_id, expand)
+
+
+async def get_room_bookings(db: AsyncSession, room_id: int, expand: Optional[str] = None) -> List[dict]:
+    return await db.run_sync(booking_service.get_room_bookings, room_id, expand)
+
+
+async def get_upcoming_bookings(
+        db: AsyncSession,
+        user_id: Optional[int] = None,
+        expand: Optional[str] = None
+) -> List[dict]:
+    return await db.run_sync(booking_service.get_upcoming_bookings, user_id, expand)
+
+
+async def get_active_bookings(db: AsyncSession, expand: Optional[str] = None) -> List[dict]:
+    return await db.run_sync(booking_service.get_active_bookings, expand)
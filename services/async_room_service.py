@@ -0,0 +1,59 @@
+"""
+Async versions of room_service for the async stack (DB_ASYNC=true), running the
+sync service on the AsyncSession's greenlet (see async_booking_service).
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from schemas.rooms import Rooms
+from models.rooms_model import RoomBase, RoomUpdate
+from services import room_service
+from typing import List, Optional, Tuple
+from datetime import datetime
+
+
+async def get_all_rooms(
+        db: AsyncSession,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        is_available: Optional[bool] = None,
+        room_type: Optional[str] = None,
+        fields: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    return await db.run_sync(room_service.get_all_rooms, cursor, limit, is_available, room_type, fields)
+
+
+async def search_available_rooms(
+        db: AsyncSession,
+        check_in: datetime,
+        check_out: datetime,
+        guests: int = 1,
+        room_type: Optional[str] = None
+) -> List[dict]:
+    return await db.run_sync(room_service.search_available_rooms, check_in, check_out, guests, room_type)
+
+
+async def get_room_by_id(db: AsyncSession, room_id: int) -> Optional[Rooms]:
+    return await db.run_sync(room_service.get_room_by_id, room_id)
+
+
+async def create_room(db: AsyncSession, room: RoomBase, current_user_data: dict) -> Rooms:
+    return await db.run_sync(room_service.create_room, room, current_user_data)
+
+
+async def update_room(db: AsyncSession, room_id: int, room_update: RoomUpdate) -> Optional[Rooms]:
+    return await db.run_sync(room_service.update_room, room_id, room_update)
+
+
+async def delete_room(db: AsyncSession, room_id: int) -> bool:
+    return await db.run_sync(room_service.delete_room, room_id)
+
+
+async def get_available_rooms(db: AsyncSession) -> List[Rooms]:
+    return await db.run_sync(room_service.get_available_rooms)
+
+
+async def update_room_availability(db: AsyncSession, room_id: int, is_available: bool) -> Optional[Rooms]:
+    return await db.run_sync(room_service.update_room_availability, room_id, is_available)
+
+
+async def set_room_maintenance(db: AsyncSession, room_id: int, under_maintenance: bool) -> Optional[Rooms]:
+    return await db.run_sync(room_service.set_room_maintenance, room_id, under_maintenance)
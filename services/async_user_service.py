@@ -0,0 +1,41 @@
+"""
+Async versions of user_service for the async stack (DB_ASYNC=true), running the
+sync service on the AsyncSession's greenlet (see async_booking_service).
+"""
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.user_model import UserCreate, UserUpdate
+from services import user_service
+from typing import Optional
+from utils.auth import store_rehashed_password
+from utils.password_hashing import hash_password_async, verify_and_update_async
+
+
+async def get_all_users(db: AsyncSession, cursor: Optional[str] = None, limit: int = 100, fields: Optional[str] = None):
+    return await db.run_sync(user_service.get_all_users, cursor, limit, fields)
+
+
+async def get_user_by_id(db: AsyncSession, user_id: int):
+    return await db.run_sync(user_service.get_user_by_id, user_id)
+
+
+async def create_user(db: AsyncSession, user: UserCreate):
+    # Hash outside run_sync so the event loop awaits the hashing pool instead of blocking on it
+    password_hash = await hash_password_async(user.password)
+    return await db.run_sync(user_service.create_user, user, password_hash)
+
+
+async def update_user(db: AsyncSession, user_id: int, user_update: UserUpdate):
+    password_hash = await hash_password_async(user_update.password) if user_update.password else None
+    return await db.run_sync(user_service.update_user, user_id, user_update, password_hash)
+
+
+async def authenticate_user_service(db: AsyncSession, email: str, password: str):
+    user = await db.run_sync(user_service.get_user_by_email, email)
+    if not user:
+        return None
+    verified, new_hash = await verify_and_update_async(password, user.password)
+    if not verified:
+        return None
+    if new_hash:
+        await db.run_sync(store_rehashed_password, user, new_hash)
+    return user
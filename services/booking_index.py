@@ -0,0 +1,135 @@
+from bisect import bisect_left, insort
+from datetime import date, datetime
+from operator import itemgetter
+from threading import RLock
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+import time
+
+from config import get_settings
+from database import SessionLocal
+from schemas.bookings import Bookings
+from utils.stays import get_stay_night_range
+
+BOOKING_INDEX_ENABLED = get_settings().booking_index_enabled
+BOOKING_INDEX_MAX_AGE_SECONDS = get_settings().booking_index_max_age_seconds
+
+ACTIVE_STATUSES = ("pending", "confirmed")
+
+# (first night, day after the last night, booking_id), kept sorted by first night per room.
+# Stays are compared by night like the room_nights ledger, not by check-in/out time.
+Stay = Tuple[date, date, int]
+
+_lock = RLock()
+_stays_by_room: Dict[int, List[Stay]] = {}
+_room_by_booking: Dict[int, int] = {}
+_loaded_at: Optional[float] = None
+
+_start = itemgetter(0)
+
+
+def _is_stale() -> bool:
+    return _loaded_at is None or time.monotonic() - _loaded_at > BOOKING_INDEX_MAX_AGE_SECONDS
+
+
+def build(db: Session) -> int:
+    """Load every active booking into the index, replacing its current content"""
+    rows = db.query(Bookings.id, Bookings.room_id, Bookings.check_in, Bookings.check_out).filter(
+        Bookings.status.in_(ACTIVE_STATUSES)
+    ).all()
+
+    stays_by_room: Dict[int, List[Stay]] = {}
+    room_by_booking: Dict[int, int] = {}
+    for booking_id, room_id, check_in, check_out in rows:
+        stays_by_room.setdefault(room_id, []).append((*get_stay_night_range(check_in, check_out), booking_id))
+        room_by_booking[booking_id] = room_id
+
+    for stays in stays_by_room.values():
+        stays.sort(key=_start)
+
+    global _stays_by_room, _room_by_booking, _loaded_at
+    with _lock:
+        _stays_by_room = stays_by_room
+        _room_by_booking = room_by_booking
+        _loaded_at = time.monotonic()
+    return len(rows)
+
+
+def warm_up() -> None:
+    """Build the index at application startup when it is enabled"""
+    if not BOOKING_INDEX_ENABLED:
+        return
+
+    db = SessionLocal()
+    try:
+        build(db)
+    finally:
+        db.close()
+
+
+def invalidate() -> None:
+    """Force a reload from the database on the next lookup"""
+    global _loaded_at
+    with _lock:
+        _loaded_at = None
+
+
+def has_conflict(
+        db: Session,
+        room_id: int,
+        check_in: datetime,
+        check_out: datetime,
+        exclude_booking_id: Optional[int] = None
+) -> bool:
+    """
+    Check the index for an active stay holding one of the nights of [check_in, check_out).
+    Active stays of one room never share a night, so their ends are sorted the same
+    way as their first nights and only the closest stay starting before the requested
+    end has to be compared: one bisect per call.
+    """
+    if not BOOKING_INDEX_ENABLED:
+        return False
+
+    if _is_stale():
+        build(db)
+
+    first_night, end = get_stay_night_range(check_in, check_out)
+    with _lock:
+        stays = _stays_by_room.get(room_id)
+        if not stays:
+            return False
+
+        position = bisect_left(stays, end, key=_start)
+        while position > 0:
+            position -= 1
+            _, stay_end, booking_id = stays[position]
+            if booking_id == exclude_booking_id:
+                continue
+            return stay_end > first_night
+    return False
+
+
+def remove(booking_id: int) -> None:
+    """Drop a booking from the index"""
+    with _lock:
+        room_id = _room_by_booking.pop(booking_id, None)
+        if room_id is None:
+            return
+        stays = _stays_by_room.get(room_id, [])
+        for position, stay in enumerate(stays):
+            if stay[2] == booking_id:
+                del stays[position]
+                break
+
+
+def sync(booking: Bookings) -> None:
+    """Mirror a committed booking: indexed while active, removed otherwise"""
+    if not BOOKING_INDEX_ENABLED:
+        return
+
+    with _lock:
+        remove(booking.id)
+        if booking.status in ACTIVE_STATUSES:
+            stay = (*get_stay_night_range(booking.check_in, booking.check_out), booking.id)
+            insort(_stays_by_room.setdefault(booking.room_id, []), stay, key=_start)
+            _room_by_booking[booking.id] = booking.room_id
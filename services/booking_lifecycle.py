@@ -0,0 +1,153 @@
+"""Expire stale pending bookings and complete past stays, periodically or via python -m services.booking_lifecycle"""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+from sqlalchemy import delete, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from config import get_settings
+from database import SessionLocal, get_engine
+from schemas.bookings import Bookings
+from schemas.room_nights import RoomNights
+from services import booking_index
+import asyncio
+import logging
+import zlib
+
+settings = get_settings()
+
+BOOKING_LIFECYCLE_ENABLED = settings.booking_lifecycle_enabled
+BOOKING_LIFECYCLE_INTERVAL_SECONDS = settings.booking_lifecycle_interval_seconds
+BOOKING_PENDING_TTL_MINUTES = settings.booking_pending_ttl_minutes
+BOOKING_LIFECYCLE_BATCH_SIZE = settings.booking_lifecycle_batch_size
+
+EXPIRED = "expired"
+COMPLETED = "completed"
+LOCK_NAME = "hotel.booking_lifecycle"
+
+log = logging.getLogger(__name__)
+
+_task: Optional[asyncio.Task] = None
+
+
+@contextmanager
+def advisory_lock(engine: Engine, name: str) -> Iterator[bool]:
+    """
+    Try to take a named database lock without waiting, on a connection of its own; yields
+    whether it was taken. The lock belongs to that connection (MySQL GET_LOCK, PostgreSQL
+    advisory locks), so a worker dying mid-sweep gives it up with the connection. Other
+    databases (SQLite in local runs) have no such lock: it is always taken.
+    """
+    dialect = engine.dialect.name
+    if dialect == "mysql":
+        take, release, params = "SELECT GET_LOCK(:name, 0)", "SELECT RELEASE_LOCK(:name)", {"name": name}
+    elif dialect == "postgresql":
+        take, release = "SELECT pg_try_advisory_lock(:key)", "SELECT pg_advisory_unlock(:key)"
+        params = {"key": zlib.crc32(name.encode())}
+    else:
+        yield True
+        return
+
+    with engine.connect() as connection:
+        acquired = bool(connection.execute(text(take), params).scalar())
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                connection.execute(text(release), params)
+
+
+def _transition(db: Session, old_status: str, conditions: list, new_status: str, batch_size: int) -> int:
+    """
+    Move every booking in old_status matching conditions to new_status, batch_size rows per
+    transaction, releasing their nights. The ids are locked while they move (skipping rows
+    another transaction holds), and both statements re-check old_status, so a booking whose
+    status changed since it was picked keeps its status and its nights.
+    """
+    moved = 0
+    while True:
+        ids: List[int] = list(db.scalars(
+            select(Bookings.id).where(Bookings.status == old_status, *conditions).order_by(Bookings.id)
+            .limit(batch_size).with_for_update(skip_locked=True)
+        ))
+        if not ids:
+            break
+
+        still_in_old_status = select(Bookings.id).where(Bookings.id.in_(ids), Bookings.status == old_status)
+        db.execute(delete(RoomNights).where(RoomNights.booking_id.in_(still_in_old_status)))
+        moved += db.execute(
+            update(Bookings).where(Bookings.id.in_(ids), Bookings.status == old_status).values(status=new_status),
+            execution_options={"synchronize_session": False}
+        ).rowcount
+        db.commit()
+        for booking_id in ids:
+            booking_index.remove(booking_id)
+
+        if len(ids) < batch_size:
+            break
+    return moved
+
+
+def run_transitions(db: Session, now: Optional[datetime] = None,
+                    batch_size: int = BOOKING_LIFECYCLE_BATCH_SIZE) -> dict:
+    """Expire stale pending bookings and complete past stays; returns how many of each moved"""
+    now = now or datetime.now()
+    expired = _transition(db, "pending", [
+        Bookings.created_at < now - timedelta(minutes=BOOKING_PENDING_TTL_MINUTES)
+    ], EXPIRED, batch_size)
+    completed = _transition(db, "confirmed", [Bookings.check_out <= now], COMPLETED, batch_size)
+    return {"expired": expired, "completed": completed}
+
+
+def sweep() -> Optional[dict]:
+    """One pass, unless another worker is running one (then None)"""
+    with advisory_lock(get_engine(), LOCK_NAME) as acquired:
+        if not acquired:
+            return None
+        db = SessionLocal()
+        try:
+            moved = run_transitions(db)
+        finally:
+            db.close()
+
+    if any(moved.values()):
+        log.info("booking lifecycle sweep", extra=moved)
+    return moved
+
+
+async def _run_periodically() -> None:
+    while True:
+        await asyncio.sleep(BOOKING_LIFECYCLE_INTERVAL_SECONDS)
+        try:
+            await run_in_threadpool(sweep)
+        except Exception:
+            # The next sweep picks up whatever this one left
+            log.exception("booking lifecycle sweep failed")
+
+
+def start() -> None:
+    """Schedule the sweep on the running event loop (from the lifespan hook), when enabled"""
+    global _task
+    if BOOKING_LIFECYCLE_ENABLED and _task is None:
+        _task = asyncio.get_running_loop().create_task(_run_periodically(), name="booking-lifecycle")
+
+
+async def stop() -> None:
+    global _task
+    if _task is None:
+        return
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
+
+
+if __name__ == "__main__":
+    from utils.structured_log import configure_logging
+    import schemas.rooms, schemas.users  # noqa: F401 (the Bookings relationships need them mapped)
+
+    configure_logging()
+    log.info("booking lifecycle sweep done", extra=sweep() or {"skipped": "another worker holds the lock"})
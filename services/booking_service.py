@@ -1,22 +1,100 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, defer, selectinload
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
 from schemas.bookings import Bookings
+from schemas.room_nights import RoomNights
+from schemas.rooms import Rooms
 from models.booking_model import BookingCreate, BookingUpdate
-from services.room_service import get_room_by_id
+from services import booking_index, report_service, room_catalog
+from services.room_service import DEFAULT_LIST_FIELDS as ROOM_SUMMARY_FIELDS, room_to_dict
+from services.user_service import user_to_dict
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
+from database import read_session
+from utils.pagination import paginate
+from utils.projection import parse_fields, project_rows
+from utils.stays import get_stay_nights
+import csv
+import io
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+MAX_BULK_BOOKINGS = 200
+
+EXPORT_COLUMNS = (
+    Bookings.id, Bookings.room_id, Bookings.user_id, Bookings.check_in, Bookings.check_out,
+    Bookings.guests, Bookings.total_price, Bookings.status, Bookings.created_at, Bookings.created_by
+)
+EXPORT_BATCH_SIZE = 1000
+
+# Fields a list view may select; the notes Text column is only sent when asked for
+LIST_FIELDS = tuple(column.name for column in Bookings.__table__.columns)
+DEFAULT_LIST_FIELDS = tuple(name for name in LIST_FIELDS if name != "notes")
+
+# Relations the list endpoints can embed with ?expand=
+EXPANDABLE = {"room": Bookings.room, "user": Bookings.user}
+
+
+def parse_expand(expand: Optional[str], fields: Optional[str] = None) -> List[str]:
+    """Validate an `?expand=room,user` list; expanded rows always carry the default fields"""
+    if not expand:
+        return []
+    if fields:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fields and expand cannot be combined"
+        )
+    names = list(dict.fromkeys(name.strip() for name in expand.split(",") if name.strip()))
+    unknown = [name for name in names if name not in EXPANDABLE]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot expand: {', '.join(unknown)}. Allowed: {', '.join(EXPANDABLE)}"
+        )
+    return names
+
+
+def _with_expand(query, expand: List[str]):
+    """Eager load the expanded relations: one extra IN query each, whatever the number of rows"""
+    return query.options(*(selectinload(EXPANDABLE[name]) for name in expand))
+
+
+def _booking_rows(bookings: List[Bookings], expand: List[str], fields=LIST_FIELDS) -> List[dict]:
+    rows = []
+    for db_booking in bookings:
+        row = {name: getattr(db_booking, name) for name in fields}
+        if "room" in expand:
+            row["room"] = room_to_dict(db_booking.room, ROOM_SUMMARY_FIELDS)
+        if "user" in expand:
+            row["user"] = user_to_dict(db_booking.user) if db_booking.user else None
+        rows.append(row)
+    return rows
 
 
 def get_all_bookings(
         db: Session,
-        skip: int = 0,
+        cursor: Optional[str] = None,
         limit: int = 100,
         status: Optional[str] = None,
-        user_id: Optional[int] = None
-) -> List[Bookings]:
-    """Get all bookings with optional filters"""
-    query = db.query(Bookings)
+        user_id: Optional[int] = None,
+        fields: Optional[str] = None,
+        expand: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Get a page of bookings ordered by (check_in, id) with optional filters.
+    Only the requested fields (DEFAULT_LIST_FIELDS otherwise) are selected, no entities are built,
+    unless related rows are expanded.
+    """
+    expand = parse_expand(expand, fields)
+    if expand:
+        selected, returned = None, DEFAULT_LIST_FIELDS
+        query = _with_expand(db.query(Bookings).options(defer(Bookings.notes)), expand)
+    else:
+        selected, returned = parse_fields(fields, LIST_FIELDS, DEFAULT_LIST_FIELDS, required=("check_in", "id"))
+        query = db.query(*(getattr(Bookings, name) for name in selected))
 
     if status:
         query = query.filter(Bookings.status == status)
@@ -24,7 +102,56 @@ def get_all_bookings(
     if user_id:
         query = query.filter(Bookings.user_id == user_id)
 
-    return query.offset(skip).limit(limit).all()
+    rows, next_cursor = paginate(query, Bookings.check_in, Bookings.id, cursor, limit)
+    if expand:
+        return _booking_rows(rows, expand, returned), next_cursor
+    return project_rows(rows, returned), next_cursor
+
+
+def export_bookings(
+        export_format: str = "ndjson",
+        status: Optional[str] = None,
+        user_id: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Stream bookings as NDJSON or CSV lines.
+    Only the export columns are selected and rows come from a server-side cursor
+    in batches of EXPORT_BATCH_SIZE, so memory stays flat whatever the table size.
+    The generator owns its session because it outlives the request handler; history
+    doesn't need read-your-writes, so it always reads from a replica when there is one.
+    """
+    db = read_session()
+    try:
+        query = select(*EXPORT_COLUMNS).order_by(Bookings.id)
+        if status:
+            query = query.where(Bookings.status == status)
+        if user_id:
+            query = query.where(Bookings.user_id == user_id)
+
+        rows = db.execute(query.execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE))
+        names = [column.key for column in EXPORT_COLUMNS]
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(names)
+            for partition in rows.partitions():
+                writer.writerows(
+                    [value.isoformat() if isinstance(value, datetime) else value for value in row]
+                    for row in partition
+                )
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            for partition in rows.partitions():
+                yield "".join(
+                    json.dumps(dict(zip(names, row)), default=datetime.isoformat) + "\n"
+                    for row in partition
+                )
+    finally:
+        db.close()
 
 
 def get_booking_by_id(db: Session, booking_id: int) -> Optional[Bookings]:
@@ -32,88 +159,232 @@ def get_booking_by_id(db: Session, booking_id: int) -> Optional[Bookings]:
     return db.query(Bookings).filter(Bookings.id == booking_id).first()
 
 
-def check_room_availability(
+def has_booking_conflict(
         db: Session,
         room_id: int,
         check_in: datetime,
         check_out: datetime,
         exclude_booking_id: Optional[int] = None
 ) -> bool:
-    """Check if a room is available for the given date range"""
-    query = db.query(Bookings).filter(
-        Bookings.room_id == room_id,
-        Bookings.status.in_(["pending", "confirmed"]),  # Only check active bookings
-        or_(
-            # New booking starts during existing booking
-            and_(Bookings.check_in <= check_in, Bookings.check_out > check_in),
-            # New booking ends during existing booking
-            and_(Bookings.check_in < check_out, Bookings.check_out >= check_out),
-            # New booking completely contains existing booking
-            and_(Bookings.check_in >= check_in, Bookings.check_out <= check_out)
-        )
-    )
+    """
+    A miss in the booking index skips the database; a hit is confirmed against the
+    room_nights ledger, since the stay may have been cancelled, deleted or expired by
+    another worker since this worker's index was loaded
+    """
+    if not booking_index.has_conflict(db, room_id, check_in, check_out, exclude_booking_id):
+        return False
 
-    # Exclude current booking when updating
+    query = db.query(RoomNights.night).filter(
+        RoomNights.room_id == room_id,
+        RoomNights.night.in_(get_stay_nights(check_in, check_out))
+    )
     if exclude_booking_id:
-        query = query.filter(Bookings.id != exclude_booking_id)
+        query = query.filter(RoomNights.booking_id != exclude_booking_id)
+    if query.first() is None:
+        booking_index.invalidate()
+        return False
+    return True
+
 
-    conflicting_bookings = query.first()
-    return conflicting_bookings is None
+def release_room_nights(db: Session, booking_id: int) -> None:
+    """Remove the ledger rows of a booking inside the current transaction"""
+    db.query(RoomNights).filter(RoomNights.booking_id == booking_id).delete(synchronize_session=False)
+
+
+def reserve_room_nights(db: Session, db_booking: Bookings) -> None:
+    """
+    Flush the booking and write its room_nights rows inside the current transaction
+    (release_room_nights first when it already had some).
+    Every active booking claims one (room_id, night) primary key per night, so the
+    database itself rejects an overlapping booking, whichever worker inserts it.
+    """
+    try:
+        db.flush()
+        if db_booking.status in booking_index.ACTIVE_STATUSES:
+            db.execute(insert(RoomNights), [
+                {"room_id": db_booking.room_id, "night": night, "booking_id": db_booking.id}
+                for night in get_stay_nights(db_booking.check_in, db_booking.check_out)
+            ])
+    except IntegrityError:
+        db.rollback()
+        booking_index.invalidate()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Room is already booked for the selected dates"
+        )
 
 
-def create_booking(db: Session, booking: BookingCreate, current_user_data: dict) -> Bookings:
-    """Create a new booking"""
-    user = current_user_data["user"]
-    token = current_user_data["token"]
+def _stats_snapshot(db_booking: Bookings) -> tuple:
+    return db_booking.status, db_booking.check_in, db_booking.check_out, db_booking.total_price
 
-    # You can log or use token if needed (e.g., auditing)
-    print(f"User {user.email} creating booking with token: {token[:10]}...")
 
-    # Validate dates
-    if booking.check_out <= booking.check_in:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Check-out date must be after check-in date"
-        )
+def record_booking_stats(db: Session, room_type, snapshot: tuple, sign: int = 1) -> None:
+    """Add or remove a booking state from the daily rollup when it counts as sold"""
+    booking_status, check_in, check_out, total_price = snapshot
+    if booking_status in report_service.REVENUE_STATUSES:
+        report_service.record_stay(db, room_type, get_stay_nights(check_in, check_out), total_price, sign)
+
 
-    # Check if room exists
-    room = get_room_by_id(db, booking.room_id)
+def _require_room(room: Optional[room_catalog.RoomRecord], room_id: int) -> room_catalog.RoomRecord:
+    """Reject bookings for rooms that don't exist (any more)"""
     if not room:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Room with id {booking.room_id} not found"
+            detail=f"Room with id {room_id} not found"
         )
+    return room
+
+
+def _validate_room(room: Optional[room_catalog.RoomRecord], room_id: int, guests: int) -> None:
+    """Reject bookings for missing, unavailable or too small rooms"""
+    _require_room(room, room_id)
 
-    # Check if room is available
     if not room.is_available or room.is_under_maintenance:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Room is not available for booking"
         )
 
-    # Check for booking conflicts
-    if not check_room_availability(db, booking.room_id, booking.check_in, booking.check_out):
+    if guests > room.capacity:
         raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Room is already booked for the selected dates"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Number of guests ({guests}) exceeds room capacity ({room.capacity})"
         )
 
-    # Check guest capacity
-    if booking.guests > room.capacity:
+
+def create_booking(db: Session, booking: BookingCreate, current_user_data: dict) -> Bookings:
+    """Create a new booking"""
+    user = current_user_data["user"]
+
+    # Validate dates
+    if booking.check_out <= booking.check_in:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Number of guests ({booking.guests}) exceeds room capacity ({room.capacity})"
+            detail="Check-out date must be after check-in date"
+        )
+
+    # Check the room exists, is bookable and fits the guests against the in-process catalog
+    _validate_room(room_catalog.get_room_record(db, booking.room_id), booking.room_id, booking.guests)
+
+    # Check for booking conflicts, without a DB round trip when the in-memory index has none
+    if has_booking_conflict(db, booking.room_id, booking.check_in, booking.check_out):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Room is already booked for the selected dates"
         )
 
-    # Create booking
+    # Confirm the room against the database inside the booking's transaction
+    room = room_catalog.confirm_room_record(db, booking.room_id)
+    _validate_room(room, booking.room_id, booking.guests)
+
+    # Create booking; the room_nights insert is the final conflict check
     booking_data = booking.dict()
     db_booking = Bookings(**booking_data, created_by=user.id)
     db.add(db_booking)
+    reserve_room_nights(db, db_booking)
+    record_booking_stats(db, room.type, _stats_snapshot(db_booking))
     db.commit()
     db.refresh(db_booking)
+    booking_index.sync(db_booking)
+    log.info("booking created", extra={"booking_id": db_booking.id, "room_id": db_booking.room_id, "user_id": user.id})
     return db_booking
 
 
+def _booking_row(db_booking: Bookings) -> dict:
+    return {column.name: getattr(db_booking, column.name) for column in Bookings.__table__.columns}
+
+
+def create_bookings_bulk(db: Session, bookings: List[BookingCreate], current_user_data: dict) -> List[dict]:
+    """
+    Create a group of bookings all-or-nothing.
+    Rooms are loaded in one query, every requested night is checked against the
+    room_nights ledger in one query, and the rows are inserted with executemany.
+    Any invalid item rejects the whole group with per-item errors.
+    """
+    user = current_user_data["user"]
+
+    if not bookings or len(bookings) > MAX_BULK_BOOKINGS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A bulk request must contain between 1 and {MAX_BULK_BOOKINGS} bookings"
+        )
+
+    room_ids = {booking.room_id for booking in bookings}
+    rooms = {room.id: room for room in db.query(Rooms).filter(Rooms.id.in_(room_ids)).all()}
+
+    requested_nights = [get_stay_nights(booking.check_in, booking.check_out) for booking in bookings]
+    all_nights = [night for nights in requested_nights for night in nights]
+    taken = set(
+        db.query(RoomNights.room_id, RoomNights.night).filter(
+            RoomNights.room_id.in_(room_ids),
+            RoomNights.night.between(min(all_nights), max(all_nights))
+        ).all()
+    )
+
+    errors = []
+    has_conflict = False
+    for index, (booking, nights) in enumerate(zip(bookings, requested_nights)):
+        room = rooms.get(booking.room_id)
+        if booking.check_out <= booking.check_in:
+            error = "Check-out date must be after check-in date"
+        elif not room:
+            error = f"Room with id {booking.room_id} not found"
+        elif not room.is_available or room.is_under_maintenance:
+            error = "Room is not available for booking"
+        elif booking.guests > room.capacity:
+            error = f"Number of guests ({booking.guests}) exceeds room capacity ({room.capacity})"
+        elif any((booking.room_id, night) in taken for night in nights):
+            # Also catches two items of the same request claiming the same night
+            error = "Room is already booked for the selected dates"
+            has_conflict = True
+        else:
+            taken.update((booking.room_id, night) for night in nights)
+            continue
+        errors.append({"index": index, "error": error})
+
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT if has_conflict else status.HTTP_400_BAD_REQUEST,
+            detail=errors
+        )
+
+    try:
+        # The flush inserts every booking with one executemany, reading the generated ids
+        # back through RETURNING where the driver supports it (row by row otherwise), then
+        # one SELECT loads the columns the database filled in
+        db_bookings = [Bookings(**booking.dict(), created_by=user.id) for booking in bookings]
+        db.add_all(db_bookings)
+        db.flush()
+        db.query(Bookings).filter(Bookings.id.in_([db_booking.id for db_booking in db_bookings])) \
+            .populate_existing().all()
+
+        db.execute(insert(RoomNights), [
+            {"room_id": db_booking.room_id, "night": night, "booking_id": db_booking.id}
+            for db_booking, nights in zip(db_bookings, requested_nights)
+            if db_booking.status in booking_index.ACTIVE_STATUSES
+            for night in nights
+        ])
+    except IntegrityError:
+        # Another worker claimed one of the nights since they were read
+        db.rollback()
+        booking_index.invalidate()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Room is already booked for the selected dates"
+        )
+
+    for db_booking in db_bookings:
+        record_booking_stats(db, rooms[db_booking.room_id].type, _stats_snapshot(db_booking))
+
+    # Snapshot the rows before commit expires them, to avoid a refresh per booking
+    rows = [_booking_row(db_booking) for db_booking in db_bookings]
+    db.commit()
+
+    for row in rows:
+        booking_index.sync(Bookings(**row))
+    return [{"index": index, "booking": row} for index, row in enumerate(rows)]
+
+
 def update_booking(db: Session, booking_id: int, booking_update: BookingUpdate) -> Optional[Bookings]:
     """Update an existing booking"""
     db_booking = get_booking_by_id(db, booking_id)
@@ -134,34 +405,48 @@ def update_booking(db: Session, booking_id: int, booking_update: BookingUpdate)
         )
 
     # Check for conflicts if dates are changing
-    if "check_in" in update_data or "check_out" in update_data:
-        if not check_room_availability(
-                db,
-                db_booking.room_id,
-                check_in,
-                check_out,
-                exclude_booking_id=booking_id
-        ):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail="Room is already booked for the selected dates"
-            )
-
-    # Check guest capacity if being updated
+    dates_changed = "check_in" in update_data or "check_out" in update_data
+    if dates_changed and has_booking_conflict(
+            db,
+            db_booking.room_id,
+            check_in,
+            check_out,
+            exclude_booking_id=booking_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Room is already booked for the selected dates"
+        )
+
+    # Check guest capacity if being updated, then confirm it inside the transaction
+    room = _require_room(room_catalog.get_room_record(db, db_booking.room_id), db_booking.room_id)
     if "guests" in update_data:
-        room = get_room_by_id(db, db_booking.room_id)
-        if update_data["guests"] > room.capacity:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Number of guests exceeds room capacity ({room.capacity})"
-            )
+        for room in (room, room_catalog.confirm_room_record(db, db_booking.room_id)):
+            _require_room(room, db_booking.room_id)
+            if update_data["guests"] > room.capacity:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Number of guests exceeds room capacity ({room.capacity})"
+                )
 
     # Apply updates
+    previous_stats = _stats_snapshot(db_booking)
     for key, value in update_data.items():
         setattr(db_booking, key, value)
 
+    # Re-claim the nights when the stay or its status changed
+    if dates_changed or "status" in update_data:
+        release_room_nights(db, booking_id)
+        reserve_room_nights(db, db_booking)
+
+    current_stats = _stats_snapshot(db_booking)
+    if current_stats != previous_stats:
+        record_booking_stats(db, room.type, previous_stats, -1)
+        record_booking_stats(db, room.type, current_stats)
+
     db.commit()
     db.refresh(db_booking)
+    booking_index.sync(db_booking)
     return db_booking
 
 
@@ -171,8 +456,11 @@ def delete_booking(db: Session, booking_id: int) -> bool:
     if not db_booking:
         return False
 
+    release_room_nights(db, booking_id)
+    record_booking_stats(db, db_booking.room.type, _stats_snapshot(db_booking), -1)
     db.delete(db_booking)
     db.commit()
+    booking_index.remove(booking_id)
     return True
 
 
@@ -188,9 +476,12 @@ def cancel_booking(db: Session, booking_id: int) -> Optional[Bookings]:
             detail="Booking is already cancelled"
         )
 
+    record_booking_stats(db, db_booking.room.type, _stats_snapshot(db_booking), -1)
     db_booking.status = "cancelled"
+    release_room_nights(db, booking_id)
     db.commit()
     db.refresh(db_booking)
+    booking_index.sync(db_booking)
     return db_booking
 
 
@@ -200,46 +491,59 @@ def confirm_booking(db: Session, booking_id: int) -> Optional[Bookings]:
     if not db_booking:
         return None
 
-    if db_booking.status != "pending":
+    # Conditional on the status still being pending, so a concurrent expiry or cancel wins
+    confirmed = db.execute(
+        update(Bookings).where(Bookings.id == booking_id, Bookings.status == "pending").values(status="confirmed")
+    ).rowcount
+    if not confirmed:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot confirm booking with status: {db_booking.status}"
         )
 
-    db_booking.status = "confirmed"
+    record_booking_stats(db, db_booking.room.type, _stats_snapshot(db_booking))
     db.commit()
     db.refresh(db_booking)
+    booking_index.sync(db_booking)
     return db_booking
 
 
-def get_user_bookings(db: Session, user_id: int) -> List[Bookings]:
+def get_user_bookings(db: Session, user_id: int, expand: Optional[str] = None) -> List[dict]:
     """Get all bookings for a specific user"""
-    return db.query(Bookings).filter(Bookings.user_id == user_id).all()
+    expand = parse_expand(expand)
+    query = _with_expand(db.query(Bookings), expand)
+    return _booking_rows(query.filter(Bookings.user_id == user_id).all(), expand)
 
 
-def get_room_bookings(db: Session, room_id: int) -> List[Bookings]:
+def get_room_bookings(db: Session, room_id: int, expand: Optional[str] = None) -> List[dict]:
     """Get all bookings for a specific room"""
-    return db.query(Bookings).filter(Bookings.room_id == room_id).all()
+    expand = parse_expand(expand)
+    query = _with_expand(db.query(Bookings), expand)
+    return _booking_rows(query.filter(Bookings.room_id == room_id).all(), expand)
 
 
-def get_upcoming_bookings(db: Session, user_id: Optional[int] = None) -> List[Bookings]:
+def get_upcoming_bookings(db: Session, user_id: Optional[int] = None, expand: Optional[str] = None) -> List[dict]:
     """Get upcoming bookings (check-in date in the future)"""
-    query = db.query(Bookings).filter(
+    expand = parse_expand(expand)
+    query = _with_expand(db.query(Bookings), expand).filter(
         Bookings.check_in > datetime.now(),
-        Bookings.status.in_(["pending", "confirmed"])
+        Bookings.status.in_(booking_index.ACTIVE_STATUSES)
     )
 
     if user_id:
         query = query.filter(Bookings.user_id == user_id)
 
-    return query.order_by(Bookings.check_in).all()
+    return _booking_rows(query.order_by(Bookings.check_in).all(), expand)
 
 
-def get_active_bookings(db: Session) -> List[Bookings]:
+def get_active_bookings(db: Session, expand: Optional[str] = None) -> List[dict]:
     """Get currently active bookings (guests are currently checked in)"""
+    expand = parse_expand(expand)
     now = datetime.now()
-    return db.query(Bookings).filter(
+    bookings = _with_expand(db.query(Bookings), expand).filter(
         Bookings.check_in <= now,
         Bookings.check_out > now,
         Bookings.status == "confirmed"
     ).all()
+    return _booking_rows(bookings, expand)
@@ -0,0 +1,195 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from schemas.bookings import Bookings
+from schemas.daily_room_stats import DailyRoomStats
+from schemas.rooms import Rooms, RoomType
+from fastapi import HTTPException, status
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, timedelta
+from collections import defaultdict
+from utils.stays import get_stay_nights
+import argparse
+import logging
+
+log = logging.getLogger(__name__)
+
+# Bookings in these statuses count as sold room-nights (a completed booking is a confirmed
+# one whose stay is over, see booking_lifecycle)
+REVENUE_STATUSES = ("confirmed", "completed")
+MAX_REPORT_DAYS = 366
+REBUILD_BATCH_SIZE = 1000
+
+StatsKey = Tuple[date, RoomType]
+
+
+def _upsert_stats(db: Session, deltas: Dict[StatsKey, List[float]]) -> None:
+    """Add (rooms_sold, revenue) deltas to the rollup rows in one statement"""
+    if not deltas:
+        return
+
+    rows = [
+        {"stat_date": stat_date, "room_type": room_type, "rooms_sold": sold, "revenue": revenue}
+        for (stat_date, room_type), (sold, revenue) in deltas.items()
+    ]
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        statement = mysql.insert(DailyRoomStats).values(rows)
+        statement = statement.on_duplicate_key_update(
+            rooms_sold=DailyRoomStats.rooms_sold + statement.inserted.rooms_sold,
+            revenue=DailyRoomStats.revenue + statement.inserted.revenue
+        )
+    else:
+        insert_for = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = insert_for(DailyRoomStats).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[DailyRoomStats.stat_date, DailyRoomStats.room_type],
+            set_={
+                "rooms_sold": DailyRoomStats.rooms_sold + statement.excluded.rooms_sold,
+                "revenue": DailyRoomStats.revenue + statement.excluded.revenue
+            }
+        )
+    db.execute(statement)
+
+
+def record_stay(
+        db: Session,
+        room_type: RoomType,
+        nights: List[date],
+        total_price: float,
+        sign: int = 1
+) -> None:
+    """
+    Add (sign=1) or remove (sign=-1) a stay from the daily rollup inside the current
+    transaction. The price is spread evenly over the nights of the stay.
+    """
+    revenue_per_night = total_price / len(nights)
+    _upsert_stats(db, {(night, room_type): [sign, sign * revenue_per_night] for night in nights})
+
+
+def rebuild_daily_room_stats(db: Session, start: Optional[date] = None, end: Optional[date] = None) -> int:
+    """
+    Recompute the rollup from the bookings table, for [start, end] or for every day.
+    Only meant for repairs and backfills; the booking service keeps it current.
+    Returns the number of rollup rows written.
+    """
+    stats = db.query(DailyRoomStats)
+    bookings = db.query(Bookings.check_in, Bookings.check_out, Bookings.total_price, Rooms.type).join(
+        Rooms, Rooms.id == Bookings.room_id
+    ).filter(Bookings.status.in_(REVENUE_STATUSES))
+
+    if start:
+        stats = stats.filter(DailyRoomStats.stat_date >= start)
+        bookings = bookings.filter(Bookings.check_out >= start)
+    if end:
+        stats = stats.filter(DailyRoomStats.stat_date <= end)
+        bookings = bookings.filter(Bookings.check_in < end + timedelta(days=1))
+
+    deltas: Dict[StatsKey, List[float]] = defaultdict(lambda: [0, 0.0])
+    for check_in, check_out, total_price, room_type in bookings.yield_per(REBUILD_BATCH_SIZE):
+        nights = get_stay_nights(check_in, check_out)
+        for night in nights:
+            if (start and night < start) or (end and night > end):
+                continue
+            deltas[(night, room_type)][0] += 1
+            deltas[(night, room_type)][1] += total_price / len(nights)
+
+    stats.delete(synchronize_session=False)
+    if deltas:
+        db.execute(insert(DailyRoomStats), [
+            {"stat_date": stat_date, "room_type": room_type, "rooms_sold": sold, "revenue": revenue}
+            for (stat_date, room_type), (sold, revenue) in deltas.items()
+        ])
+    db.commit()
+    return len(deltas)
+
+
+def _report_days(start: date, end: date) -> List[date]:
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End date must not be before start date"
+        )
+    if (end - start).days >= MAX_REPORT_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Reports cover at most {MAX_REPORT_DAYS} days"
+        )
+    return [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+
+def _report_rows(
+        db: Session,
+        start: date,
+        end: date,
+        room_type: Optional[str]
+) -> Iterable[Tuple[date, RoomType, int, float, int]]:
+    """Yield (day, room_type, rooms_sold, revenue, rooms_total) from the rollup, zero-filled"""
+    days = _report_days(start, end)
+
+    inventory_query = db.query(Rooms.type, func.count(Rooms.id)).group_by(Rooms.type)
+    stats_query = db.query(DailyRoomStats).filter(DailyRoomStats.stat_date.between(start, end))
+    if room_type:
+        inventory_query = inventory_query.filter(Rooms.type == RoomType(room_type))
+        stats_query = stats_query.filter(DailyRoomStats.room_type == RoomType(room_type))
+
+    inventory = dict(inventory_query.all())
+    stats = {(row.stat_date, row.room_type): row for row in stats_query.all()}
+
+    for day in days:
+        for current_type in RoomType:
+            rooms_total = inventory.get(current_type, 0)
+            row = stats.get((day, current_type))
+            if not rooms_total and not row:
+                continue
+            yield day, current_type, row.rooms_sold if row else 0, row.revenue if row else 0.0, rooms_total
+
+
+def get_occupancy_report(db: Session, start: date, end: date, room_type: Optional[str] = None) -> List[dict]:
+    """Occupancy % per day and room type, read from the rollup only"""
+    return [
+        {
+            "date": day,
+            "room_type": current_type.value,
+            "rooms_sold": rooms_sold,
+            "rooms_total": rooms_total,
+            "occupancy_percent": round(100 * rooms_sold / rooms_total, 2) if rooms_total else 0.0
+        }
+        for day, current_type, rooms_sold, _, rooms_total in _report_rows(db, start, end, room_type)
+    ]
+
+
+def get_revenue_report(db: Session, start: date, end: date, room_type: Optional[str] = None) -> List[dict]:
+    """Revenue, ADR and RevPAR per day and room type, read from the rollup only"""
+    return [
+        {
+            "date": day,
+            "room_type": current_type.value,
+            "rooms_sold": rooms_sold,
+            "revenue": round(revenue, 2),
+            "adr": round(revenue / rooms_sold, 2) if rooms_sold else 0.0,
+            "revpar": round(revenue / rooms_total, 2) if rooms_total else 0.0
+        }
+        for day, current_type, rooms_sold, revenue, rooms_total in _report_rows(db, start, end, room_type)
+    ]
+
+
+if __name__ == "__main__":
+    # python -m services.report_service --start 2025-01-01 --end 2025-12-31
+    parser = argparse.ArgumentParser(description="Rebuild the daily_room_stats rollup from bookings")
+    parser.add_argument("--start", type=date.fromisoformat, default=None)
+    parser.add_argument("--end", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    from database import SessionLocal
+    from utils.structured_log import configure_logging
+
+    configure_logging()
+
+    session = SessionLocal()
+    try:
+        written = rebuild_daily_room_stats(session, args.start, args.end)
+        log.info("rebuilt daily_room_stats", extra={"rows": written})
+    finally:
+        session.close()
@@ -0,0 +1,109 @@
+from threading import Lock
+from typing import Dict, Optional
+from sqlalchemy.orm import Session
+from config import get_settings
+from schemas.rooms import Rooms, RoomType
+from utils.http_cache import ResponseCache
+import time
+
+settings = get_settings()
+
+ROOM_RESPONSE_CACHE_TTL_SECONDS = settings.room_response_cache_ttl_seconds
+ROOM_RESPONSE_CACHE_MAX_ENTRIES = settings.room_response_cache_max_entries
+ROOM_CATALOG_MAX_AGE_SECONDS = settings.room_catalog_max_age_seconds
+
+# Catalog version, bumped by every room_service write once it has committed.
+# It is per process: writes made by other workers only show up here after the TTL.
+_version = 0
+_lock = Lock()
+
+response_cache = ResponseCache(ROOM_RESPONSE_CACHE_TTL_SECONDS, ROOM_RESPONSE_CACHE_MAX_ENTRIES)
+
+
+class RoomRecord:
+    """The room fields the booking write path validates against, frozen"""
+    __slots__ = ("id", "type", "capacity", "is_available", "is_under_maintenance")
+
+    def __init__(self, id: int, type: RoomType, capacity: int, is_available: bool, is_under_maintenance: bool):
+        for name, value in zip(self.__slots__, (id, type, capacity, is_available, is_under_maintenance)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("RoomRecord is immutable")
+
+    def __eq__(self, other):
+        return isinstance(other, RoomRecord) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self):
+        return f"RoomRecord(id={self.id}, capacity={self.capacity}, is_available={self.is_available})"
+
+
+RECORD_COLUMNS = (Rooms.id, Rooms.type, Rooms.capacity, Rooms.is_available, Rooms.is_under_maintenance)
+
+_records: Optional[Dict[int, RoomRecord]] = None
+_records_version = -1
+_records_loaded_at = 0.0
+
+
+def version() -> int:
+    return _version
+
+
+def bump() -> int:
+    """
+    Mark the room catalog as changed: cached catalog responses stop being served and
+    the room records are reloaded on next use
+    """
+    global _version
+    with _lock:
+        _version += 1
+        return _version
+
+
+def _load_records(db: Session) -> Dict[int, RoomRecord]:
+    global _records, _records_version, _records_loaded_at
+    loaded_version = _version
+    records = {row[0]: RoomRecord(*row) for row in db.query(*RECORD_COLUMNS).all()}
+    with _lock:
+        _records = records
+        _records_version = loaded_version
+        _records_loaded_at = time.monotonic()
+    return records
+
+
+def get_room_record(db: Session, room_id: int) -> Optional[RoomRecord]:
+    """
+    The room's record from the in-process catalog, loading every room on first use, after
+    a room write or once the records are older than ROOM_CATALOG_MAX_AGE_SECONDS.
+    A room the catalog doesn't know is read through from the database, so rooms created
+    by other workers are bookable straight away.
+    """
+    records = _records
+    if (records is None or _records_version != _version
+            or time.monotonic() - _records_loaded_at > ROOM_CATALOG_MAX_AGE_SECONDS):
+        records = _load_records(db)
+
+    record = records.get(room_id)
+    if record is None:
+        row = db.query(*RECORD_COLUMNS).filter(Rooms.id == room_id).first()
+        if row is None:
+            return None
+        record = RoomRecord(*row)
+        with _lock:
+            records[room_id] = record
+    return record
+
+
+def confirm_room_record(db: Session, room_id: int) -> Optional[RoomRecord]:
+    """
+    Re-read the room inside the caller's transaction with a shared row lock, so it can't
+    be put under maintenance or resized until the booking commits. The catalog is
+    refreshed when it turns out to be stale.
+    """
+    row = db.query(*RECORD_COLUMNS).filter(Rooms.id == room_id).with_for_update(read=True).first()
+    record = RoomRecord(*row) if row else None
+    if record != (_records or {}).get(room_id):
+        bump()
+    return record
@@ -1,19 +1,38 @@
 from sqlalchemy.orm import Session
-from schemas.rooms import Rooms
+from sqlalchemy import case, func
+from schemas.rooms import Rooms, RoomType
+from schemas.room_nights import RoomNights
 from models.rooms_model import RoomBase, RoomUpdate
 from fastapi import HTTPException, status
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import datetime
+from utils.pagination import paginate
+from utils.projection import parse_fields, project_rows
+from utils.stays import get_stay_night_range
+from services import room_catalog
+import logging
+
+log = logging.getLogger(__name__)
+
+# Fields a list view may select; the description Text column is only sent when asked for
+LIST_FIELDS = tuple(column.name for column in Rooms.__table__.columns)
+DEFAULT_LIST_FIELDS = tuple(name for name in LIST_FIELDS if name != "description")
 
 
 def get_all_rooms(
         db: Session,
-        skip: int = 0,
+        cursor: Optional[str] = None,
         limit: int = 100,
         is_available: Optional[bool] = None,
-        room_type: Optional[str] = None
-) -> List[Rooms]:
-    """Get all rooms with optional filters"""
-    query = db.query(Rooms)
+        room_type: Optional[str] = None,
+        fields: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Get a page of rooms ordered by (room_number, id) with optional filters.
+    Only the requested fields (DEFAULT_LIST_FIELDS otherwise) are selected, no entities are built.
+    """
+    selected, returned = parse_fields(fields, LIST_FIELDS, DEFAULT_LIST_FIELDS, required=("room_number", "id"))
+    query = db.query(*(getattr(Rooms, name) for name in selected))
 
     if is_available is not None:
         query = query.filter(Rooms.is_available == is_available)
@@ -21,7 +40,68 @@ def get_all_rooms(
     if room_type:
         query = query.filter(Rooms.type == room_type)
 
-    return query.offset(skip).limit(limit).all()
+    rows, next_cursor = paginate(query, Rooms.room_number, Rooms.id, cursor, limit)
+    return project_rows(rows, returned), next_cursor
+
+
+def search_available_rooms(
+        db: Session,
+        check_in: datetime,
+        check_out: datetime,
+        guests: int = 1,
+        room_type: Optional[str] = None
+) -> List[dict]:
+    """
+    Find rooms free for the whole date range in a single query.
+    Rooms are filtered on type/availability (served by ix_room_type_availability) and
+    anti-joined against the room_nights ledger on the requested nights, the same check
+    booking makes, then ranked by the closest capacity fit and the price after discount.
+    """
+    if check_out <= check_in:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Check-out date must be after check-in date"
+        )
+
+    first_night, end = get_stay_night_range(check_in, check_out)
+    taken_night = db.query(RoomNights.night).filter(
+        RoomNights.room_id == Rooms.id,
+        RoomNights.night >= first_night,
+        RoomNights.night < end
+    )
+
+    discount = case(
+        (Rooms.has_offer == True, func.coalesce(Rooms.discount_percent, 0.0)),
+        else_=0.0
+    )
+    effective_price = (Rooms.price_per_night * (100 - discount) / 100).label("effective_price_per_night")
+
+    query = db.query(Rooms, effective_price).filter(
+        Rooms.is_available == True,
+        Rooms.is_under_maintenance == False,
+        Rooms.capacity >= guests,
+        ~taken_night.exists()
+    )
+
+    if room_type:
+        query = query.filter(Rooms.type == RoomType(room_type))
+
+    nights = (end - first_night).days
+    results = []
+    for room, price in query.order_by(Rooms.capacity, effective_price, Rooms.room_number).all():
+        result = room_to_dict(room)
+        result["effective_price_per_night"] = round(price, 2)
+        result["nights"] = nights
+        result["total_price"] = round(price * nights, 2)
+        results.append(result)
+    return results
+
+
+def room_to_dict(room: Rooms, fields=None) -> dict:
+    """Column values of a room (all, or only `fields`), ready to be validated into a response model or encoded"""
+    if fields is None:
+        return {column.name: getattr(room, column.name) for column in Rooms.__table__.columns}
+    return {name: getattr(room, name) for name in fields}
 
 
 def get_room_by_id(db: Session, room_id: int) -> Optional[Rooms]:
@@ -37,10 +117,6 @@ def get_room_by_number(db: Session, room_number: str) -> Optional[Rooms]:
 def create_room(db: Session, room: RoomBase, current_user_data: dict) -> Rooms:
     """Create a new room"""
     user = current_user_data["user"]
-    token = current_user_data["token"]
-
-    # You can log or use token if needed (e.g., auditing)
-    print(f"User {user.email} creating booking with token: {token[:10]}...")
 
     # Check if room number already exists
     existing_room = get_room_by_number(db, room.room_number)
@@ -54,7 +130,9 @@ def create_room(db: Session, room: RoomBase, current_user_data: dict) -> Rooms:
     db_room = Rooms(**room_data, created_by=user.id)
     db.add(db_room)
     db.commit()
+    room_catalog.bump()
     db.refresh(db_room)
+    log.info("room created", extra={"room_id": db_room.id, "user_id": user.id})
     return db_room
 
 
@@ -71,6 +149,7 @@ def update_room(db: Session, room_id: int, room_update: RoomUpdate) -> Optional[
         setattr(db_room, key, value)
 
     db.commit()
+    room_catalog.bump()
     db.refresh(db_room)
     return db_room
 
@@ -83,10 +162,11 @@ def delete_room(db: Session, room_id: int) -> bool:
 
     db.delete(db_room)
     db.commit()
+    room_catalog.bump()
     return True
 
 
-def aget_available_rooms(db: Session) -> List[Rooms]:
+def get_available_rooms(db: Session) -> List[Rooms]:
     """Get only available rooms (not under maintenance)"""
     return db.query(Rooms).filter(
         Rooms.is_available == True,
@@ -102,6 +182,7 @@ def update_room_availability(db: Session, room_id: int, is_available: bool) -> O
 
     db_room.is_available = is_available
     db.commit()
+    room_catalog.bump()
     db.refresh(db_room)
     return db_room
 
@@ -117,5 +198,6 @@ def set_room_maintenance(db: Session, room_id: int, under_maintenance: bool) ->
         db_room.is_available = False  # Make unavailable when under maintenance
 
     db.commit()
+    room_catalog.bump()
     db.refresh(db_room)
     return db_room
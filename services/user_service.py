@@ -1,20 +1,40 @@
 from sqlalchemy.orm import Session
+from typing import Optional
 from schemas.users import Users
 from utils.auth import hash_password, authenticate_user
 from models.user_model import UserCreate, UserUpdate
+from utils.pagination import paginate
+from utils.projection import parse_fields, project_rows
+from utils.principal_cache import principal_cache
 
 
-def get_all_users(db: Session):
-    return db.query(Users).all()
+# Fields a list view may select; the password hash never leaves the service
+LIST_FIELDS = tuple(column.name for column in Users.__table__.columns if column.name != "password")
+
+
+def user_to_dict(user: Users) -> dict:
+    """Column values of a user without the password hash"""
+    return {name: getattr(user, name) for name in LIST_FIELDS}
+
+
+def get_all_users(db: Session, cursor: Optional[str] = None, limit: int = 100, fields: Optional[str] = None):
+    selected, returned = parse_fields(fields, LIST_FIELDS, LIST_FIELDS, required=("created_on", "id"))
+    query = db.query(*(getattr(Users, name) for name in selected))
+    rows, next_cursor = paginate(query, Users.created_on, Users.id, cursor, limit)
+    return project_rows(rows, returned), next_cursor
 
 
 def get_user_by_id(db: Session, user_id: int):
     return db.query(Users).filter(Users.id == user_id).first()
 
 
-def create_user(db: Session, user: UserCreate):
+def get_user_by_email(db: Session, email: str):
+    return db.query(Users).filter(Users.email == email).first()
+
+
+def create_user(db: Session, user: UserCreate, password_hash: Optional[str] = None):
     user_data = user.dict()
-    user_data["password"] = hash_password(user.password)
+    user_data["password"] = password_hash or hash_password(user.password)
     db_user = Users(**user_data)
     db.add(db_user)
     db.commit()
@@ -22,19 +42,22 @@ def create_user(db: Session, user: UserCreate):
     return db_user
 
 
-def update_user(db: Session, user_id: int, user_update: UserUpdate):
+def update_user(db: Session, user_id: int, user_update: UserUpdate, password_hash: Optional[str] = None):
     db_user = get_user_by_id(db, user_id)
     if not db_user:
         return None
 
     update_data = {k: v for k, v in user_update.dict().items() if v not in [None, ""]}
     if "password" in update_data:
-        update_data["password"] = hash_password(update_data["password"])
+        update_data["password"] = password_hash or hash_password(update_data["password"])
 
+    previous_email = db_user.email
     for key, value in update_data.items():
         setattr(db_user, key, value)
 
     db.commit()
+    # Role, password or email may have changed: drop the cached principal right away
+    principal_cache.invalidate(previous_email, db_user.email)
     db.refresh(db_user)
     return db_user
 
@@ -0,0 +1,21 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from database import Base
+from schemas.rooms import Rooms, RoomType
+from schemas.users import Users
+import schemas.bookings, schemas.daily_room_stats, schemas.room_nights  # noqa: F401 (register the tables)
+import pytest
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add(Users(id=1, first_name="a", last_name="b", email="a@b.com", password="x", role="ADMIN"))
+    session.add(Rooms(id=1, room_number="101", type=RoomType.single, price_per_night=100, capacity=2, created_by=1))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
@@ -0,0 +1,46 @@
+from datetime import datetime
+from fastapi import HTTPException
+from models.booking_model import BookingCreate
+from schemas.bookings import Bookings
+from schemas.room_nights import RoomNights
+from schemas.users import Users
+from services import booking_index, booking_service
+import pytest
+
+
+@pytest.fixture
+def index(monkeypatch):
+    monkeypatch.setattr(booking_index, "BOOKING_INDEX_ENABLED", True)
+    booking_index.invalidate()
+    yield
+    booking_index.invalidate()
+
+
+def _book(db, day: int) -> Bookings:
+    booking = BookingCreate(
+        room_id=1, check_in=datetime(2031, 1, day, 14), check_out=datetime(2031, 1, day + 2, 11), guests=1,
+        total_price=200, status="confirmed"
+    )
+    return booking_service.create_booking(db, booking, {"user": db.get(Users, 1), "token": ""})
+
+
+def test_index_hit_is_confirmed_against_the_ledger(db, index):
+    first = _book(db, 1)
+    with pytest.raises(HTTPException) as error:
+        _book(db, 2)
+    assert error.value.status_code == 409
+
+    # Cancelled by another worker: this worker's index still has the stay
+    db.query(RoomNights).filter(RoomNights.booking_id == first.id).delete()
+    db.query(Bookings).filter(Bookings.id == first.id).update({"status": "cancelled"})
+    db.commit()
+
+    assert _book(db, 2).status == "confirmed"
+
+
+def test_index_compares_nights_like_the_ledger(db, index):
+    first = _book(db, 1)
+    assert booking_index.has_conflict(db, 1, datetime(2031, 1, 2, 9), datetime(2031, 1, 5, 11))
+    # Checking in on the check-out day before the previous guest leaves takes no night of theirs
+    assert not booking_index.has_conflict(db, 1, datetime(2031, 1, 3, 10), datetime(2031, 1, 5, 11))
+    assert not booking_index.has_conflict(db, 1, datetime(2031, 1, 2, 9), datetime(2031, 1, 5, 11), first.id)
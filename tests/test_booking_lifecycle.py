@@ -0,0 +1,39 @@
+from datetime import datetime
+from fastapi import HTTPException
+from models.booking_model import BookingCreate
+from schemas.bookings import Bookings
+from schemas.daily_room_stats import DailyRoomStats
+from schemas.room_nights import RoomNights
+from schemas.users import Users
+from services import booking_lifecycle, booking_service
+import pytest
+
+
+def _pending_booking(db) -> Bookings:
+    booking = BookingCreate(
+        room_id=1, check_in=datetime(2031, 1, 1, 14), check_out=datetime(2031, 1, 3, 11), guests=1, total_price=200
+    )
+    return booking_service.create_booking(db, booking, {"user": db.get(Users, 1), "token": ""})
+
+
+def test_confirm_counts_the_stay(db):
+    booking = _pending_booking(db)
+
+    assert booking_service.confirm_booking(db, booking.id).status == "confirmed"
+    assert db.query(RoomNights).count() == 2
+    assert [stats.rooms_sold for stats in db.query(DailyRoomStats).all()] == [1, 1]
+
+
+def test_expired_booking_can_not_be_confirmed(db):
+    booking = _pending_booking(db)
+    db.query(Bookings).update({"created_at": datetime(2020, 1, 1)})
+    db.commit()
+
+    assert booking_lifecycle.run_transitions(db) == {"expired": 1, "completed": 0}
+    with pytest.raises(HTTPException) as error:
+        booking_service.confirm_booking(db, booking.id)
+
+    assert error.value.status_code == 400
+    assert db.get(Bookings, booking.id).status == "expired"
+    assert db.query(RoomNights).count() == 0
+    assert db.query(DailyRoomStats).count() == 0
@@ -0,0 +1,23 @@
+from datetime import datetime
+from models.booking_model import BookingCreate
+from schemas.bookings import Bookings
+from schemas.room_nights import RoomNights
+from schemas.users import Users
+from services import booking_service
+
+
+def test_a_cancelled_period_can_be_booked_again(db):
+    check_in, check_out = datetime(2031, 1, 1, 14), datetime(2031, 1, 3, 11)
+    requested = BookingCreate(room_id=1, check_in=check_in, check_out=check_out, guests=1, total_price=200)
+    current_user = {"user": db.get(Users, 1), "token": ""}
+
+    booking = booking_service.create_booking(db, requested, current_user)
+    booking_service.cancel_booking(db, booking.id)
+    rebooked = booking_service.create_booking(db, requested, current_user)
+    booking_service.cancel_booking(db, rebooked.id)
+    created = booking_service.create_bookings_bulk(db, [requested], current_user)
+
+    assert created[0]["booking"]["id"] not in (booking.id, rebooked.id)
+    assert created[0]["booking"]["created_at"] is not None
+    assert db.query(Bookings).count() == 3
+    assert {night.booking_id for night in db.query(RoomNights).all()} == {created[0]["booking"]["id"]}
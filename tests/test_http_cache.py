@@ -0,0 +1,20 @@
+from starlette.requests import Request
+from utils.http_cache import ResponseCache, cached_response, store_response
+from utils.read_your_writes import PIN_HEADER, make_pin
+import time
+
+
+def _request(headers=()) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/rooms/", "query_string": b"limit=10", "headers": list(headers)})
+
+
+def test_pinned_client_never_gets_a_body_cached_from_a_replica_read():
+    cache = ResponseCache(ttl_seconds=60, max_entries=10)
+    pinned = _request([(PIN_HEADER.encode(), make_pin(time.time() + 2).encode())])
+
+    store_response(cache, _request(), 2, {"items": ["stale"]})
+
+    assert cached_response(cache, _request(), 2) is not None
+    assert cached_response(cache, pinned, 2) is None
+    store_response(cache, pinned, 2, {"items": ["fresh"]})
+    assert cached_response(cache, pinned, 2).body == b'{"items":["fresh"]}'
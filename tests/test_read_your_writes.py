@@ -0,0 +1,17 @@
+from starlette.requests import Request
+from utils.read_your_writes import PIN_HEADER, make_pin, pinned_to_primary
+import time
+
+
+def _request(pin: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [(PIN_HEADER.encode(), pin.encode())]})
+
+
+def test_only_a_signed_pin_inside_the_window_reads_from_the_primary():
+    until = time.time() + 2
+
+    assert pinned_to_primary(_request(make_pin(until)))
+    assert not pinned_to_primary(_request(f"{until:.3f}"))
+    pin = make_pin(until)
+    assert not pinned_to_primary(_request(pin[:-1] + ("1" if pin.endswith("0") else "0")))
+    assert not pinned_to_primary(_request(make_pin(time.time() - 1)))
@@ -0,0 +1,19 @@
+from datetime import datetime
+from models.booking_model import BookingCreate
+from schemas.users import Users
+from services import booking_service, room_service
+
+
+def _search(db, check_in: datetime, check_out: datetime) -> list:
+    return [room["id"] for room in room_service.search_available_rooms(db, check_in, check_out)]
+
+
+def test_search_agrees_with_booking_on_nights(db):
+    booking = BookingCreate(
+        room_id=1, check_in=datetime(2031, 1, 1, 14), check_out=datetime(2031, 1, 3, 11), guests=1, total_price=200
+    )
+    booking_service.create_booking(db, booking, {"user": db.get(Users, 1), "token": ""})
+
+    assert _search(db, datetime(2031, 1, 2, 14), datetime(2031, 1, 4, 11)) == []
+    # Checking in on the check-out day, even before the previous guest leaves, is bookable
+    assert _search(db, datetime(2031, 1, 3, 10), datetime(2031, 1, 5, 11)) == [1]
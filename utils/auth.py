@@ -1,33 +1,40 @@
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import JWTError, jwt, ExpiredSignatureError
-from passlib.context import CryptContext
 from fastapi import HTTPException, status, Security, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
-from dotenv import load_dotenv
-import os
-import urllib.parse
-from database import get_db
+from sqlalchemy.orm.session import make_transient_to_detached
+from sqlalchemy.ext.asyncio import AsyncSession
+from config import get_settings
+from database import SessionLocal, get_db, get_async_db
+from utils.principal_cache import principal_cache
+from utils import password_hashing
 
 security = HTTPBearer()
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-from schemas.users import Users
+pwd_context = password_hashing.pwd_context
+from schemas.users import Users, UserRole
 
-load_dotenv()
+settings = get_settings()
 
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = urllib.parse.quote(os.getenv("ALGORITHM"))
-ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+SECRET_KEY = settings.secret_key
+ALGORITHM = settings.algorithm
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
 
 def hash_password(password: str):
-    return pwd_context.hash(password)
+    return password_hashing.hash_password(password)
 
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hashing.verify_and_update(plain_password, hashed_password)[0]
+
+
+def store_rehashed_password(db: Session, user: Users, new_hash: str):
+    """Replace a hash made with outdated Argon2 parameters after a successful login"""
+    user.password = new_hash
+    db.commit()
+    principal_cache.invalidate(user.email)
 
 
 def authenticate_user(email: str, password: str, db: Session):
@@ -38,8 +45,11 @@ def authenticate_user(email: str, password: str, db: Session):
     user = db.query(Users).filter(Users.email == email).first()
     if not user:
         return None
-    if not verify_password(password, user.password):
+    verified, new_hash = password_hashing.verify_and_update(password, user.password)
+    if not verified:
         return None
+    if new_hash:
+        store_rehashed_password(db, user, new_hash)
     return user
 
 
@@ -64,26 +74,79 @@ def verify_token(credentials: HTTPAuthorizationCredentials = Security(security))
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
 
+def _get_token_subject(token: str) -> str:
+    """Decode the JWT and return its subject (the user's email)"""
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except ExpiredSignatureError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired")
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+    username: str = payload.get("sub")
+    if username is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return username
+
+
+def _get_user_by_email(db: Session, username: str) -> Users:
+    """
+    Resolve the token subject to a Users row, served from the principal cache while the
+    entry is fresh. A cache hit is attached to the request session without a SELECT, so
+    relationships still lazy-load as usual.
+    """
+    row = principal_cache.get(username)
+    if row is not None:
+        user = Users(**row)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    # Fetch the user by email (or adjust to match your payload)
+    user = db.query(Users).filter(Users.email == username).first()
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    principal_cache.put(username, {c.name: getattr(user, c.name) for c in Users.__table__.columns})
+    return user
+
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security), db: Session = Depends(get_db)):
     """
     Extract user info from token and return user object from DB.
     """
     token = credentials.credentials
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    user = _get_user_by_email(db, _get_token_subject(token))
 
-        # Fetch the user by email (or adjust to match your payload)
-        user = db.query(Users).filter(Users.email == username).first()
-        if user is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    # ✅ Return both user and token if needed
+    return {"user": user, "token": token}
 
-        # ✅ Return both user and token if needed
-        return {"user": user, "token": token}
 
-    except ExpiredSignatureError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired")
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+def require_admin(current_user_data: dict = Depends(get_current_user)):
+    """Dependency for operator endpoints: only ADMIN users get through"""
+    if current_user_data["user"].role != UserRole.ADMIN:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return current_user_data
+
+
+def is_admin_token(token: str) -> bool:
+    """
+    Whether a bearer token belongs to an ADMIN user, for checks made outside the
+    dependency system (e.g. the profiling middleware). Never raises for a bad token.
+    """
+    db = SessionLocal()
+    try:
+        return _get_user_by_email(db, _get_token_subject(token)).role == UserRole.ADMIN
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+
+
+async def get_current_user_async(credentials: HTTPAuthorizationCredentials = Security(security),
+                                 db: AsyncSession = Depends(get_async_db)):
+    """
+    Async variant of get_current_user for the async stack: the lookup runs on the
+    AsyncSession so the event loop is never blocked.
+    """
+    token = credentials.credentials
+    user = await db.run_sync(_get_user_by_email, _get_token_subject(token))
+    return {"user": user, "token": token}
@@ -0,0 +1,140 @@
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+import time
+
+# Number of most recent checkout waits kept for the percentiles
+WAIT_SAMPLE_SIZE = 2048
+
+
+class PoolMetrics:
+    """Counters and recent checkout wait times of one connection pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_times: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+        self._lock = Lock()
+        self.engine: Optional[Engine] = None
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_times.append(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self.wait_times)
+            counters = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+            }
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(fraction * len(waits)))] * 1000, 3)
+
+        # Read through the engine: dispose() swaps in a new pool
+        pool = self.engine.pool if self.engine is not None else None
+        state = {}
+        if isinstance(pool, QueuePool):
+            capacity = pool.size() + pool._max_overflow
+            state = {
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "utilisation_percent": round(100 * pool.checkedout() / capacity, 2) if capacity > 0 else None,
+            }
+
+        return {
+            "name": self.name,
+            **state,
+            **counters,
+            "wait_ms": {
+                "samples": len(waits),
+                "p50": percentile(0.50),
+                "p90": percentile(0.90),
+                "p99": percentile(0.99),
+                "max": round(waits[-1] * 1000, 3) if waits else None,
+            },
+        }
+
+
+class _TimedCheckoutMixin:
+    """Times how long each checkout waits for a free connection (or for the timeout)"""
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+
+_registry: Dict[str, PoolMetrics] = {}
+
+
+def timed_pool_class(name: str, async_driver: bool = False) -> type:
+    """
+    Pool class to pass as create_engine(poolclass=...). The metrics live on the class,
+    so they survive pool.recreate() after engine.dispose() or a disconnect.
+    """
+    metrics = _registry.setdefault(name, PoolMetrics(name))
+    base = AsyncAdaptedQueuePool if async_driver else QueuePool
+    # The pool logs under its class's module: keep it in the sqlalchemy.pool namespace,
+    # which echo_pool and the LOG_LEVELS of "sqlalchemy.pool" configure
+    return type(
+        f"Timed{base.__name__}", (_TimedCheckoutMixin, base), {"metrics": metrics, "__module__": base.__module__}
+    )
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """Attach pool event listeners that feed the metrics registered under name"""
+    metrics = _registry.setdefault(name, PoolMetrics(name))
+    metrics.engine = engine
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.count("connects")
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.count("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        metrics.count("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.count("invalidations")
+
+    return metrics
+
+
+def get_pool_metrics() -> list:
+    """Current state of every instrumented pool"""
+    return [metrics.snapshot() for metrics in _registry.values()]
@@ -0,0 +1,96 @@
+from collections import OrderedDict
+from hashlib import sha1
+from threading import Lock
+from typing import Any, Optional, Tuple
+from fastapi import Request, Response, status
+from utils.fast_json import dumps
+from utils.read_your_writes import pinned_to_primary
+import time
+
+# Clients must revalidate every time; the ETag makes that a cheap 304
+CACHE_CONTROL = "no-cache"
+
+
+class ResponseCache:
+    """
+    Encoded JSON bodies and their ETags keyed by (path, query string, data version, pinned
+    to the primary).
+    A bumped version makes older entries unreachable, the TTL bounds how long a worker
+    can serve data another worker has already changed, and the LRU bound caps memory.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[float, bytes, str]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: tuple) -> Optional[Tuple[bytes, str]]:
+        if self.ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def put(self, key: tuple, body: bytes, etag: str) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def cache_key(request: Request, version: int) -> tuple:
+    # A body read from a lagging replica must never be served to a client pinned to the
+    # primary after its own write, so pinned requests have entries of their own
+    return request.url.path, tuple(sorted(request.query_params.multi_items())), version, pinned_to_primary(request)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return etag in (candidate[2:] if candidate.startswith("W/") else candidate for candidate in candidates)
+
+
+def _response(request: Request, body: bytes, etag: str) -> Response:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def cached_response(cache: ResponseCache, request: Request, version: int) -> Optional[Response]:
+    """The 200 or 304 for a cached entry, or None when the body has to be built"""
+    entry = cache.get(cache_key(request, version))
+    if entry is None:
+        return None
+    return _response(request, *entry)
+
+
+def store_response(cache: ResponseCache, request: Request, version: int, payload: Any) -> Response:
+    """
+    Encode the payload, cache it under the version read before it was loaded, and answer
+    with a strong ETag (a hash of the exact bytes sent)
+    """
+    body = dumps(payload)
+    etag = f'"{sha1(body).hexdigest()}"'
+    cache.put(cache_key(request, version), body, etag)
+    return _response(request, body, etag)
+
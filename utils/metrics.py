@@ -0,0 +1,87 @@
+from typing import Optional
+from config import get_settings
+import os
+import time
+
+# With several workers each process writes its samples to this local directory and
+# /metrics aggregates them. It must exist, and be emptied before the server starts
+# (stale files from a previous run would be summed in).
+PROMETHEUS_MULTIPROC_DIR = get_settings().prometheus_multiproc_dir
+# prometheus_client picks the storage backend from the environment at import time, and
+# treats an empty variable as "write to the current directory"
+if not PROMETHEUS_MULTIPROC_DIR:
+    os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest, multiprocess
+)
+
+# Requests that match no route share one label value, so scanners can't blow up cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ["method", "route", "status"]
+)
+LATENCY = Histogram(
+    "http_request_duration_seconds", "Time spent handling HTTP requests", ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being handled", ["method"], multiprocess_mode="livesum"
+)
+
+
+def _route_template(scope) -> str:
+    """The path template of the matched route, e.g. /bookings/{booking_id}"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class PrometheusMiddleware:
+    """ASGI middleware recording request counts, in-flight requests and latencies per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code: Optional[int] = None
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            # No response started means the app raised: it is served as a 500
+            labels = (method, _route_template(scope), str(status_code or 500))
+            REQUESTS.labels(*labels).inc()
+            LATENCY.labels(*labels).observe(elapsed)
+
+
+def render_metrics() -> bytes:
+    """All metrics in the Prometheus text format, summed over every worker in multiprocess mode"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (call from the process manager, e.g. gunicorn child_exit)"""
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(pid)
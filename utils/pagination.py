@@ -0,0 +1,59 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+import binascii
+import json
+
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort_value: Any, last_id: int) -> str:
+    """Build an opaque cursor from the (sort_key, id) of the last row of a page"""
+    if isinstance(sort_value, datetime):
+        sort_value = {"dt": sort_value.isoformat()}
+    payload = json.dumps([sort_value, last_id], separators=(",", ":")).encode()
+    return urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, int]:
+    """Read back the (sort_key, id) stored in a cursor"""
+    try:
+        payload = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, last_id = json.loads(payload)
+        if isinstance(sort_value, dict):
+            sort_value = datetime.fromisoformat(sort_value["dt"])
+        return sort_value, int(last_id)
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def paginate(query: Query, sort_column, id_column, cursor: Optional[str], limit: int) -> Tuple[List, Optional[str]]:
+    """
+    Keyset pagination on (sort_column, id_column).
+    Each page seeks past the last row of the previous one instead of using OFFSET,
+    so deep pages cost the same as the first one when a (filter..., sort, id) index exists.
+    Returns the rows and the cursor of the next page (None on the last page).
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            sort_column > sort_value,
+            and_(sort_column == sort_value, id_column > last_id)
+        ))
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(sort_column, id_column).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last_row = rows[-1]
+    return rows, encode_cursor(getattr(last_row, sort_column.key), getattr(last_row, id_column.key))
@@ -0,0 +1,110 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Optional, Tuple
+from threading import Lock
+from passlib.context import CryptContext
+from config import get_settings
+import asyncio
+import multiprocessing
+import os
+
+settings = get_settings()
+
+ARGON2_TIME_COST = settings.argon2_time_cost
+ARGON2_MEMORY_COST = settings.argon2_memory_cost  # KiB
+ARGON2_PARALLELISM = settings.argon2_parallelism
+PASSWORD_HASH_WORKERS = settings.password_hash_workers
+
+
+def build_context(time_cost: int, memory_cost: int, parallelism: int) -> CryptContext:
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        argon2__rounds=time_cost,
+        argon2__memory_cost=memory_cost,
+        argon2__parallelism=parallelism
+    )
+
+
+pwd_context = build_context(ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM)
+
+# Set in each pool process by _init_worker
+_worker_context: Optional[CryptContext] = None
+
+
+def _init_worker(time_cost: int, memory_cost: int, parallelism: int) -> None:
+    global _worker_context
+    _worker_context = build_context(time_cost, memory_cost, parallelism)
+
+
+def _hash(password: str) -> str:
+    return (_worker_context or pwd_context).hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return (_worker_context or pwd_context).verify_and_update(password, hashed_password)
+
+
+_executor: Optional[Executor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = Lock()
+
+
+def _get_executor() -> Optional[Executor]:
+    """
+    The process pool, created on first use in the current process. Re-created after a
+    fork (e.g. gunicorn preloading the app) since pool handles can't cross processes.
+    """
+    global _executor, _executor_pid
+    if PASSWORD_HASH_WORKERS <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM)
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None and _executor_pid == os.getpid():
+            _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _submit(fn, *args) -> Future:
+    executor = _get_executor()
+    if executor is None:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as exc:
+            future.set_exception(exc)
+        return future
+    return executor.submit(fn, *args)
+
+
+def hash_password(password: str) -> str:
+    """Hash on the process pool; the calling thread only waits for the result"""
+    return _submit(_hash, password).result()
+
+
+def verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password against its stored hash on the process pool. On success the
+    second item is a fresh hash when the stored one uses outdated parameters, else None.
+    """
+    return _submit(_verify_and_update, password, hashed_password).result()
+
+
+async def hash_password_async(password: str) -> str:
+    return await asyncio.wrap_future(_submit(_hash, password))
+
+
+async def verify_and_update_async(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await asyncio.wrap_future(_submit(_verify_and_update, password, hashed_password))
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+from config import get_settings
+import time
+
+PRINCIPAL_CACHE_TTL_SECONDS = get_settings().principal_cache_ttl_seconds
+PRINCIPAL_CACHE_MAX_ENTRIES = get_settings().principal_cache_max_entries
+
+
+class PrincipalCache:
+    """
+    Bounded LRU of user rows keyed by token subject (email), each entry expiring after
+    the TTL. Entries are plain column dicts, never ORM instances, so nothing is shared
+    between sessions. The cache is per process: explicit invalidation only reaches the
+    worker that made the change, the TTL bounds staleness everywhere else.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, subject: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, row = entry
+            if expires_at <= time.monotonic():
+                del self._entries[subject]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return row
+
+    def put(self, subject: str, row: dict) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, row)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *subjects: Optional[str]) -> None:
+        with self._lock:
+            for subject in subjects:
+                if subject is not None and self._entries.pop(subject, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_TTL_SECONDS, PRINCIPAL_CACHE_MAX_ENTRIES)
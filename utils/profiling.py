@@ -0,0 +1,228 @@
+"""Opt-in request profiling (PROFILING_ENABLED): sampled stacks of chosen requests, kept on disk"""
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from config import get_settings
+import glob
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+settings = get_settings()
+
+PROFILING_ENABLED = settings.profiling_enabled
+PROFILE_SAMPLE_RATE = settings.profile_sample_rate
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = b"x-profile-id"
+PROFILE_ID = re.compile(r"^\d+-\d+$")
+
+# One profiled request at a time per process bounds the overhead
+_active = threading.Lock()
+
+
+class ProfileStore:
+    """Profiles on disk, keeping only the newest max_entries (a ring buffer shared by the workers)"""
+
+    def __init__(self, directory: str, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def _path(self, profile_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{extension}")
+
+    def save(self, profile_id: str, meta: dict, samples: Counter) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(profile_id, "collapsed"), "w") as collapsed:
+            collapsed.writelines(f"{stack} {count}\n" for stack, count in samples.most_common())
+        # The metadata goes last: a profile is listed only once all of it is there
+        with open(self._path(profile_id, "json"), "w") as metadata:
+            json.dump(meta, metadata)
+        self._prune()
+
+    def _prune(self) -> None:
+        for stale in sorted(glob.glob(self._path("*", "json")), reverse=True)[self.max_entries:]:
+            profile_id = os.path.basename(stale)[:-len(".json")]
+            for extension in ("json", "collapsed"):
+                try:
+                    os.remove(self._path(profile_id, extension))
+                except FileNotFoundError:
+                    pass  # pruned by another worker
+
+    def list(self, limit: int = 50, route: Optional[str] = None) -> List[dict]:
+        """Newest first"""
+        profiles = []
+        for path in sorted(glob.glob(self._path("*", "json")), reverse=True):
+            try:
+                with open(path) as metadata:
+                    meta = json.load(metadata)
+            except (FileNotFoundError, ValueError):
+                continue
+            if route is None or meta["route"] == route:
+                profiles.append(meta)
+                if len(profiles) >= limit:
+                    break
+        return profiles
+
+    def path(self, profile_id: str) -> str:
+        """The collapsed stacks of a profile"""
+        path = self._path(profile_id, "collapsed")
+        if not PROFILE_ID.match(profile_id) or not os.path.exists(path):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Profile {profile_id} not found")
+        return path
+
+
+profile_store = ProfileStore(settings.profile_dir, settings.profile_max_entries)
+
+
+def _frame_label(code, labels: dict) -> str:
+    label = labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        for prefix in sys.path:
+            if prefix and filename.startswith(prefix):
+                filename = filename[len(prefix):].lstrip(os.sep)
+                break
+        label = labels[code] = f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+    return label
+
+
+def _dependency_codes(dependant) -> set:
+    """Code objects of an endpoint and all its dependencies, i.e. what runs in the threadpool"""
+    codes = set()
+    call = getattr(dependant, "call", None)
+    if call is not None and hasattr(call, "__code__"):
+        codes.add(call.__code__)
+    for sub_dependant in getattr(dependant, "dependencies", []):
+        codes |= _dependency_codes(sub_dependant)
+    return codes
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the stacks of the threads working on one request: the event loop thread
+    while the request's own middleware frame is on it, and other threads while they run
+    the matched route's endpoint or dependencies (concurrent requests to the same route
+    on the sync stack can't be told apart there)
+    """
+
+    def __init__(self, scope, request_frame, interval_seconds: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.scope = scope
+        self.request_frame = request_frame
+        self.loop_thread = threading.get_ident()
+        self.interval_seconds = interval_seconds
+        self.samples: Counter = Counter()
+        self._stopped = threading.Event()
+        self._labels: dict = {}
+        self._route_codes: Optional[set] = None
+
+    def _codes(self) -> set:
+        if self._route_codes is None:
+            route = self.scope.get("route")
+            if route is None:
+                return set()  # not routed yet
+            self._route_codes = _dependency_codes(getattr(route, "dependant", None))
+        return self._route_codes
+
+    def sample(self) -> None:
+        codes = self._codes()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self.ident:
+                continue
+            stack, ours = [], False
+            while frame is not None:
+                stack.append(frame.f_code)
+                if thread_id == self.loop_thread:
+                    ours = ours or frame is self.request_frame
+                else:
+                    ours = ours or frame.f_code in codes
+                frame = frame.f_back
+            if ours:
+                self.samples[";".join(_frame_label(code, self._labels) for code in reversed(stack))] += 1
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            self.sample()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+def _wants_profile(scope) -> Optional[str]:
+    """Why this request should be profiled: an explicit header (checked for an admin later) or the sampling draw"""
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER and value.strip() in (b"1", b"true"):
+            return "header"
+    if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE:
+        return "sample"
+    return None
+
+
+async def _is_admin(scope) -> bool:
+    from utils.auth import is_admin_token
+
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                return await run_in_threadpool(is_admin_token, token.strip())
+    return False
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling the requests picked by _wants_profile into profile_store, one at a time"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        trigger = _wants_profile(scope) if scope["type"] == "http" else None
+        if trigger is None or (trigger == "header" and not await _is_admin(scope)) \
+                or not _active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.time_ns()}-{os.getpid()}"
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (PROFILE_ID_HEADER, profile_id.encode())]
+            await send(message)
+
+        started_at = datetime.now().isoformat(timespec="milliseconds")
+        sampler = StackSampler(scope, sys._getframe(), settings.profile_interval_ms / 1000)
+        try:
+            sampler.start()
+            started = time.perf_counter()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                duration = time.perf_counter() - started
+                sampler.stop()
+        finally:
+            _active.release()
+
+        route = scope.get("route")
+        meta = {
+            "id": profile_id,
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(route, "path", None),
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 2),
+            "samples": sum(sampler.samples.values()),
+            "trigger": trigger,
+            "started_at": started_at,
+            "pid": os.getpid(),
+        }
+        await run_in_threadpool(profile_store.save, profile_id, meta, sampler.samples)
@@ -0,0 +1,33 @@
+from typing import Iterable, List, Optional, Sequence, Tuple
+from fastapi import HTTPException, status
+
+
+def parse_fields(
+        fields: Optional[str],
+        allowed: Sequence[str],
+        default: Sequence[str],
+        required: Iterable[str] = ()
+) -> Tuple[List[str], List[str]]:
+    """
+    Turn a sparse fieldset (`?fields=id,room_id,check_in`) into the columns to SELECT.
+    Returns (selected, returned): the requested fields (or the default list-view fields)
+    plus the required ones such as pagination keys, and the fields the client gets back.
+    """
+    if fields:
+        returned = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in returned if name not in allowed]
+        if unknown or not returned:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(unknown) or '(none given)'}. Allowed: {', '.join(allowed)}"
+            )
+    else:
+        returned = list(default)
+
+    selected = returned + [name for name in required if name not in returned]
+    return selected, returned
+
+
+def project_rows(rows: Iterable, returned: Sequence[str]) -> List[dict]:
+    """Keep only the returned fields of projected rows"""
+    return [{name: getattr(row, name) for name in returned} for row in rows]
@@ -0,0 +1,155 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Iterator, List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from config import get_settings
+import logging
+import time
+
+settings = get_settings()
+
+SQL_STATS_ENABLED = settings.sql_stats_enabled
+SLOW_QUERY_MS = settings.slow_query_ms
+SQL_REPEAT_WARN_THRESHOLD = settings.sql_repeat_warn_threshold
+
+slow_query_log = logging.getLogger("sql.slow")
+n_plus_one_log = logging.getLogger("sql.n_plus_one")
+
+
+class QueryStats:
+    """Statements run on behalf of one request (or one recorder), and the time spent in them"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        return [(statement, times) for statement, times in self.statements.most_common() if times >= threshold]
+
+
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+# Recorders see every statement of the process, whatever the context (see record_queries)
+_recorders: List[QueryStats] = []
+_recorders_lock = Lock()
+
+
+def parameters_shape(parameters) -> str:
+    """Describe bound parameters by type only, so no values end up in the logs"""
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (dict, list, tuple)):
+        # executemany
+        return f"{len(parameters)} x {parameters_shape(parameters[0])}"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.add(statement, elapsed)
+    if _recorders:
+        with _recorders_lock:
+            for recorder in _recorders:
+                recorder.add(statement, elapsed)
+
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        slow_query_log.warning(
+            "slow query (%.1f ms): %s | parameters: %s",
+            elapsed * 1000, " ".join(statement.split())[:2000], parameters_shape(parameters)
+        )
+
+
+def install() -> None:
+    """Listen on every Engine (sync, the async engines' sync_engine, test engines)"""
+    if not SQL_STATS_ENABLED or event.contains(Engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware counting the statements each request runs. The totals go out in a
+    Server-Timing header (db;dur=<ms>;desc="<n> queries"), and statements repeated past
+    SQL_REPEAT_WARN_THRESHOLD are logged as a likely N+1.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not SQL_STATS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _request_stats.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                # Streaming bodies keep querying after this; the header covers what ran until now
+                timing = f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'.encode()
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_stats.reset(token)
+            for statement, times in stats.repeated(SQL_REPEAT_WARN_THRESHOLD):
+                n_plus_one_log.warning(
+                    "%s %s ran the same statement %d times: %s",
+                    scope["method"], scope["path"], times, " ".join(statement.split())[:500]
+                )
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryStats]:
+    """Collect every statement the process runs inside the block, e.g. around a TestClient call"""
+    install()
+    stats = QueryStats()
+    with _recorders_lock:
+        _recorders.append(stats)
+    try:
+        yield stats
+    finally:
+        with _recorders_lock:
+            _recorders.remove(stats)
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, max_repeats: int = 1) -> Iterator[QueryStats]:
+    """
+    Test helper failing when the block runs more than max_queries statements, or any one
+    statement more than max_repeats times (a query issued per row in a loop)
+
+        with assert_query_budget(5):
+            client.post("/bookings/", json=payload, headers=headers)
+    """
+    with record_queries() as stats:
+        yield stats
+
+    problems = []
+    if stats.count > max_queries:
+        problems.append(f"{stats.count} queries, budget is {max_queries}")
+    for statement, times in stats.repeated(max_repeats + 1):
+        problems.append(f"ran {times} times: {' '.join(statement.split())[:300]}")
+    if problems:
+        raise AssertionError("Query budget exceeded:\n  " + "\n  ".join(problems))
@@ -0,0 +1,77 @@
+"""
+Read-your-writes for replica reads: a client whose request changed something is pinned
+to the primary for DB_READ_YOUR_WRITES_SECONDS, so it doesn't read stale data from a
+lagging replica right after its own write.
+
+The pin is the expiry time (unix seconds) signed with SECRET_KEY, sent back on every
+successful write both as a short-lived cookie (browsers) and as a response header that API
+clients can echo on their next requests. Only signed values inside the window are
+honoured, so a client can't pin itself to the primary without writing.
+"""
+from typing import Optional
+from starlette.requests import HTTPConnection
+from config import get_settings
+import hashlib
+import hmac
+import time
+
+PIN_COOKIE = "db_primary_until"
+PIN_HEADER = "x-db-primary-until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+READ_YOUR_WRITES_SECONDS = get_settings().db_read_your_writes_seconds
+_PIN_KEY = get_settings().secret_key.encode()
+
+
+def _signature(until: str) -> str:
+    return hmac.new(_PIN_KEY, until.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def make_pin(until: float) -> str:
+    until = f"{until:.3f}"
+    return f"{until}.{_signature(until)}"
+
+
+def _parse(value: Optional[str]) -> Optional[float]:
+    """The expiry of a correctly signed pin"""
+    until, _, signature = (value or "").rpartition(".")
+    if not until or not hmac.compare_digest(signature, _signature(until)):
+        return None
+    try:
+        return float(until)
+    except ValueError:
+        return None
+
+
+def pinned_to_primary(connection: HTTPConnection) -> bool:
+    """Whether this client wrote within the window and must read from the primary"""
+    if READ_YOUR_WRITES_SECONDS <= 0:
+        return False
+    until = _parse(connection.headers.get(PIN_HEADER)) or _parse(connection.cookies.get(PIN_COOKIE))
+    now = time.time()
+    return until is not None and now < until <= now + READ_YOUR_WRITES_SECONDS
+
+
+class ReadYourWritesMiddleware:
+    """ASGI middleware pinning the client to the primary after each successful write"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or READ_YOUR_WRITES_SECONDS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = make_pin(time.time() + READ_YOUR_WRITES_SECONDS)
+                cookie = f"{PIN_COOKIE}={until}; Max-Age={int(READ_YOUR_WRITES_SECONDS) + 1}; Path=/; HttpOnly; SameSite=Lax"
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (PIN_HEADER.encode(), until.encode()),
+                    (b"set-cookie", cookie.encode()),
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,42 @@
+from typing import Set, Tuple
+from sqlalchemy.engine import Engine
+import logging
+import os
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+schema_log = logging.getLogger("schema")
+
+
+class SchemaNotAtHead(RuntimeError):
+    pass
+
+
+def schema_revisions(engine: Engine) -> Tuple[Set[str], Set[str]]:
+    """(revisions the database is stamped with, head revisions of the migration scripts)"""
+    # Alembic is only needed when the check runs, not to import the app
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_heads())
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    return current, heads
+
+
+def check_schema_at_head(engine: Engine, strict: bool = False) -> bool:
+    """
+    One round trip to alembic_version instead of inspecting every table. A database behind
+    the migrations is logged, or raises SchemaNotAtHead when strict so the worker does not start.
+    """
+    current, heads = schema_revisions(engine)
+    if current == heads:
+        return True
+
+    message = (f"database schema is at {', '.join(sorted(current)) or 'no revision'}, "
+               f"migrations head is {', '.join(sorted(heads))}: run `alembic upgrade head`")
+    if strict:
+        raise SchemaNotAtHead(message)
+    schema_log.warning(message)
+    return False
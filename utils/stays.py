@@ -0,0 +1,14 @@
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+
+
+def get_stay_night_range(check_in: datetime, check_out: datetime) -> Tuple[date, date]:
+    """First night of a stay and the day after its last one; a same-day stay still holds its check-in night"""
+    first_night = check_in.date()
+    return first_night, max(check_out.date(), first_night + timedelta(days=1))
+
+
+def get_stay_nights(check_in: datetime, check_out: datetime) -> List[date]:
+    """Nights covered by a stay (see get_stay_night_range)"""
+    first_night, end = get_stay_night_range(check_in, check_out)
+    return [first_night + timedelta(days=n) for n in range((end - first_night).days)]
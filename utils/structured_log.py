@@ -0,0 +1,191 @@
+"""JSON-lines application logging through a bounded queue and a writer thread, tagged with the request id"""
+from datetime import datetime, timezone
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from config import get_settings
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import uuid
+
+settings = get_settings()
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Ids from the client are kept when they look like ids, so they can't inject into the logs
+VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# Attributes every LogRecord has; anything else on a record came from `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines for local runs (LOG_FORMAT=text)"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s")
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a LOG_SAMPLE_RATES share of the INFO/DEBUG records of the named loggers and their children"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._by_logger: Dict[str, Optional[float]] = {}
+
+    def _rate(self, name: str) -> Optional[float]:
+        if name not in self._by_logger:
+            matches = [prefix for prefix in self.rates if name == prefix or name.startswith(prefix + ".")]
+            self._by_logger[name] = self.rates[max(matches, key=len)] if matches else None
+        return self._by_logger[name]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        rate = self._rate(record.name)
+        if rate is None:
+            return True
+        record.sample_rate = rate
+        return random.random() < rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Does in the caller's thread only what can't wait: stamping the request id and
+    rendering the message and traceback (their arguments may change afterwards).
+    Formatting and writing happen in the listener thread.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.request_id = _request_id.get()
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_handler: Optional[NonBlockingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _start_listener() -> None:
+    global _listener
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+    _listener = QueueListener(_handler.queue, output)
+    _listener.start()
+
+
+def _restart_after_fork() -> None:
+    # The listener thread doesn't survive a fork (gunicorn preload), and its queue may have
+    # been locked at that moment: the child starts over with its own
+    if _handler is not None:
+        _handler.queue = queue.Queue(settings.log_queue_size)
+        _start_listener()
+
+
+def _stop() -> None:
+    """Flush what's queued; at exit, so the last records aren't lost"""
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging() -> None:
+    """Route the root logger through the queue (once per process; later calls do nothing)"""
+    global _handler
+    if _handler is not None:
+        return
+
+    _handler = NonBlockingQueueHandler(queue.Queue(settings.log_queue_size))
+    if settings.log_sample_rates:
+        _handler.addFilter(SamplingFilter(settings.log_sample_rates))
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(settings.log_level)
+    for name, level in settings.log_levels.items():
+        logging.getLogger(name).setLevel(level)
+
+    _start_listener()
+    os.register_at_fork(after_in_child=_restart_after_fork)
+    atexit.register(_stop)
+
+
+def dropped_records() -> int:
+    """Records dropped because the queue was full, in this process"""
+    return _handler.dropped if _handler is not None else 0
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware giving each request an id: the caller's X-Request-ID when it is a
+    plausible id, a new one otherwise. It is set for everything logged while the request
+    runs and returned in the X-Request-ID response header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER:
+                candidate = value.decode("latin-1")
+                request_id = candidate if VALID_REQUEST_ID.match(candidate) else None
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = _request_id.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (REQUEST_ID_HEADER, request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _request_id.reset(token)